@@ -11,7 +11,7 @@ df["Data"] = pd.to_datetime(df["Data"])
 df["Itens"] = df["Itens"].str.strip()
 
 # Adicionar coluna de semana (domingo a sábado)
-df["Semana"] = df["Data"] - pd.to_timedelta(df["Data"].dt.weekday + 1 % 7, unit='D')
+df["Semana"] = df["Data"] - pd.to_timedelta((df["Data"].dt.weekday + 1) % 7, unit='D')
 df["Semana"] = df["Semana"].dt.date
 
 # Agrupar os dados por semana
@@ -0,0 +1,130 @@
+"""Cubo de agregação por Ano/Mes/semana/tipo.
+
+Em vez de montar máscaras (Ano == ano) & (Mes == mes) sobre as tabelas
+inteiras a cada mês, cada aba passa por um único groupby na criação do
+cubo. Os relatórios consultam totais e resumos em dicionários.
+Os valores são somas exatas em centavos (esquema.py). Com o banco, o
+cubo é montado direto da tabela de totais mantida na importação
+(Cubo.de_totais, ver banco.py), sem groupby nenhum.
+"""
+import numpy as np
+import pandas as pd
+
+# nome da aba -> (coluna de categoria, coluna de valor)
+MEDIDAS = {
+    'compras': ('tipo', 'TOTAL'),
+    'custos': ('TIPO', 'VALOR'),
+    'receb': ('Fonte', 'VALOR'),
+}
+
+# a semana entra pelo domingo de início (calendario.py), que ordena certo na virada do ano
+CHAVES = ['Ano', 'Mes', 'InicioSemana']
+
+
+def _chave(k):
+    """(ano, mes[, inicio_semana]) com ano/mês como int."""
+    return (int(k[0]), int(k[1])) + tuple(pd.Timestamp(v) for v in k[2:])
+
+
+def _indexar(serie, niveis):
+    """Agrupa a série pelos níveis e devolve {chave: sub-série} para lookup direto.
+
+    Mesmo resultado de groupby(level=niveis) + droplevel em cada grupo, mas
+    com um único sort: cada grupo é uma fatia do array ordenado (o groupby
+    copiava o MultiIndex inteiro a cada droplevel).
+    """
+    if serie.empty:
+        return {}
+    codigos, chaves = pd.factorize(serie.index.droplevel([n for n in serie.index.names if n not in niveis]),
+                                   sort=True)
+    ordem = np.argsort(codigos, kind='stable')
+    ordem = ordem[codigos[ordem] >= 0]  # chave com NaN fica de fora, como no groupby
+    limites = np.searchsorted(codigos[ordem], np.arange(len(chaves) + 1))
+    valores = serie.array[ordem]
+    resto = serie.index.droplevel(niveis)[ordem]
+    return {chave: pd.Series(valores[a:b], index=resto[a:b], name=serie.name)
+            for chave, a, b in zip(chaves, limites[:-1], limites[1:])}
+
+
+def somas_por_categoria(nome, df):
+    """Série (Ano, Mes, InicioSemana, categoria) -> soma em centavos de uma aba."""
+    col_cat, col_valor = MEDIDAS[nome]
+    # dropna=False para que linhas sem categoria continuem entrando nos totais
+    return df.groupby(CHAVES + [col_cat], dropna=False, observed=True, sort=True)[col_valor].sum()
+
+
+def totais_da_base(nome, base):
+    """(por semana, por mês, por categoria e semana, por categoria e mês) a partir de somas_por_categoria."""
+    col_cat = MEDIDAS[nome][0]
+    semana = base.groupby(level=CHAVES).sum()
+    mes = semana.groupby(level=['Ano', 'Mes']).sum()
+    # os resumos por categoria seguem o groupby original, que ignora categoria vazia
+    cat = base[base.index.get_level_values(col_cat).notna()]
+    cat_mes = cat.groupby(level=['Ano', 'Mes', col_cat], observed=True, sort=True).sum()
+    return semana, mes, cat, cat_mes
+
+
+class Cubo:
+    def __init__(self, compras_df, custos_df, receb_df):
+        frames = {'compras': compras_df, 'custos': custos_df, 'receb': receb_df}
+        self._montar({nome: totais_da_base(nome, somas_por_categoria(nome, frames[nome])) for nome in MEDIDAS})
+
+    @classmethod
+    def de_totais(cls, totais):
+        """Cubo a partir de {nome: tupla de totais_da_base} já calculados (ex.: tabela totais, ver banco.py)."""
+        cubo = cls.__new__(cls)
+        cubo._montar(totais)
+        return cubo
+
+    def _montar(self, totais):
+        self.total_mes = {}    # nome -> {(ano, mes): total}
+        self.total_semana = {} # nome -> {(ano, mes, inicio_semana): total}
+        self.por_cat_mes = {}  # nome -> {(ano, mes): Series categoria -> total}
+        self.por_cat_semana = {}
+        self.semanas_mes = {}  # (ano, mes) -> domingos das semanas com compras
+
+        for nome in MEDIDAS:
+            semana, mes, cat, cat_mes = totais[nome]
+            self.total_semana[nome] = {_chave(k): int(t) for k, t in semana.items()}
+            self.total_mes[nome] = {_chave(k): int(t) for k, t in mes.items()}
+            self.por_cat_mes[nome] = {_chave(k): s for k, s in _indexar(cat_mes, ['Ano', 'Mes']).items()}
+            self.por_cat_semana[nome] = {_chave(k): s for k, s in _indexar(cat, CHAVES).items()}
+
+        for ano, mes, semana in sorted(self.total_semana['compras']):
+            self.semanas_mes.setdefault((ano, mes), []).append(semana)
+
+    def anos(self, nome=None):
+        nomes = [nome] if nome else list(MEDIDAS)
+        return sorted({a for n in nomes for a, _ in self.total_mes[n]})
+
+    def meses(self, ano, nome=None):
+        nomes = [nome] if nome else list(MEDIDAS)
+        return sorted({m for n in nomes for a, m in self.total_mes[n] if a == ano})
+
+    def tem_dados(self, nome, ano, mes):
+        return (ano, mes) in self.total_mes[nome]
+
+    def total(self, nome, ano, mes, semana=None):
+        if semana is None:
+            return self.total_mes[nome].get((ano, mes), 0)
+        return self.total_semana[nome].get((ano, mes, semana), 0)
+
+    def totais_mes(self, ano, mes):
+        """(compras, custos, recebimentos) do mês."""
+        return tuple(self.total(nome, ano, mes) for nome in MEDIDAS)
+
+    def semanas(self, ano, mes):
+        return self.semanas_mes.get((ano, mes), [])
+
+    def resumo(self, nome, ano, mes, semana=None):
+        """DataFrame categoria/valor/PERCENTUAL ordenado do maior para o menor percentual."""
+        col_cat, col_valor = MEDIDAS[nome]
+        if semana is None:
+            serie = self.por_cat_mes[nome].get((ano, mes))
+        else:
+            serie = self.por_cat_semana[nome].get((ano, mes, semana))
+        if serie is None:
+            return pd.DataFrame(columns=[col_cat, col_valor, 'PERCENTUAL'])
+        resumo = serie.rename(col_valor).rename_axis(col_cat).reset_index()
+        resumo['PERCENTUAL'] = resumo[col_valor] / resumo[col_valor].sum() * 100
+        return resumo.sort_values(by='PERCENTUAL', ascending=False)
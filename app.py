@@ -1,61 +1,264 @@
+"""Dashboard do Café Musical (Dash).
+
+    python app.py
+
+Importar o módulo é barato: dash, plotly, pandas e os módulos de dados
+só são carregados por criar_app(), que monta o estado inicial, o app e
+os callbacks, e pelas funções que os usam.
+"""
+import json
+import os
+import threading
+import time
+
+from caminhos import ARQUIVO_PADRAO, BANCO_PADRAO
+
+INTERVALO_VERIFICACAO = 10  # segundos entre verificações da fonte dos dados
+
+# com o cafe.db (cafe-report importar) os totais saem de consultas SQL; sem ele, da planilha
+FONTE = BANCO_PADRAO if os.path.exists(BANCO_PADRAO) else ARQUIVO_PADRAO
+
+
+def totais_por_mes(cubo, nome, ano):
+    totais = {mes: total for (a, mes), total in cubo.total_mes[nome].items() if a == ano}
+    return list(totais), [centavos / 100 for centavos in totais.values()]
+
+
+def grafico_mes(cubo, nome, ano, coluna, titulo, cor):
+    # graph_objects direto: plotly.express custa ~0,3 s só para importar
+    import plotly.graph_objects as go
+
+    meses, valores = totais_por_mes(cubo, nome, ano)
+    fig = go.Figure(go.Bar(x=meses, y=valores, marker_color=cor))
+    fig.update_layout(title=titulo, xaxis_title='Mes', yaxis_title=coluna)
+    return fig
+
+
+def figuras_ano(cubo, ano):
+    """Figuras do ano já serializadas em JSON (uma vez por versão dos dados)."""
+    fig_compras = grafico_mes(cubo, 'compras', ano, 'TOTAL', 'Total Comprado por Mês', '#636EFA')
+    fig_custos = grafico_mes(cubo, 'custos', ano, 'VALOR', 'Total Custos por Mês', '#E9C46A')
+    fig_receb = grafico_mes(cubo, 'receb', ano, 'VALOR', 'Total Recebido por Mês', '#2A9D8F')
+    return [json.loads(fig.to_json()) for fig in (fig_compras, fig_custos, fig_receb)]
+
+
+def lista_altas(altas):
+    """Itens com preço em alta, da maior variação para a menor."""
+    from dash import html
+
+    if altas.empty:
+        return [html.Li('Nenhum preço em alta na última semana.')]
+    altas = altas.sort_values('variacao', ascending=False, kind='stable')
+    return [html.Li(f"{data:%d/%m} {item}: R$ {preco / 100:.2f} (mediana R$ {mediana / 100:.2f}, +{variacao * 100:.0f}%)")
+            for data, item, preco, mediana, variacao
+            in altas[['Data', 'item', 'preco', 'mediana', 'variacao']].itertuples(index=False)]
+
+
+def _reais(centavos):
+    import pandas as pd
+
+    return '' if pd.isna(centavos) else f"R$ {centavos / 100:.2f}"
+
+
+def tabela_custos(ranking):
+    """Ranking de custo por litro/unidade (embalagens.ranking_custos) como tabela HTML."""
+    from dash import html
+
+    cabecalho = html.Tr([html.Th(t) for t in ('Tipo', 'Item', 'Unidades', 'R$/unidade', 'R$/litro')])
+    linhas = [html.Tr([html.Td(tipo), html.Td(item), html.Td(f"{unidades:g}"),
+                       html.Td(_reais(custo_unidade)), html.Td(_reais(custo_litro))])
+              for tipo, item, unidades, custo_unidade, custo_litro
+              in ranking[['tipo', 'item', 'unidades', 'custo_unidade', 'custo_litro']].itertuples(index=False)]
+    return [cabecalho, *linhas]
+
+
+def montar_cubo():
+    """(cubo, altas de preço da última semana com compras, {ano: ranking de custos})."""
+    import pandas as pd
+
+    from calendario import semana_da_data
+    from precos import COLUNAS as COLUNAS_PRECOS
+
+    # sem compras não há semana a olhar
+    sem_altas = pd.DataFrame(columns=COLUNAS_PRECOS)
+    if FONTE == BANCO_PADRAO:
+        from banco import conectar, cubo_do_banco, ranking_custos_do_banco
+        from precos import altas_no_banco
+
+        con = conectar(BANCO_PADRAO)
+        try:
+            cubo = cubo_do_banco(con)
+            ultima = con.execute('SELECT MAX(Data) FROM compras').fetchone()[0]
+            altas = altas_no_banco(con, *semana_da_data(ultima)) if ultima is not None else sem_altas
+            custos = {ano: ranking_custos_do_banco(con, f'{ano}-01-01', f'{ano}-12-31') for ano in cubo.anos('compras')}
+            return cubo, altas, custos
+        finally:
+            con.close()
+
+    from agregacao import Cubo
+    from dados import carregar_planilhas, fatia_datas
+    from embalagens import ranking_custos
+    from precos import altas_da_semana
+
+    dados = carregar_planilhas(ARQUIVO_PADRAO)
+    compras = dados['compras']
+    cubo = Cubo(compras, dados['custos'], dados['receb'])
+    altas = altas_da_semana(dados, *semana_da_data(compras.index.max())) if not compras.empty else sem_altas
+    custos = {ano: ranking_custos(fatia_datas(compras, f'{ano}-01-01', f'{ano}-12-31')) for ano in cubo.anos('compras')}
+    return cubo, altas, custos
+
+
+def montar_estado(versao, mtime):
+    cubo, altas, custos = montar_cubo()
+    anos = cubo.anos('compras')
+    return {
+        'versao': versao,
+        'mtime': mtime,
+        'cubo': cubo,
+        'anos': anos,
+        'figuras': {str(ano): figuras_ano(cubo, ano) for ano in anos},
+        'altas': lista_altas(altas),
+        # ranking de custo pronto por ano: o callback só escolhe a tabela
+        'custos': {str(ano): tabela_custos(ranking) for ano, ranking in custos.items()},
+    }
+
+
+def mtimes():
+    """{arquivo: mtime} da planilha e, com o banco, do cafe.db."""
+    arquivos = dict.fromkeys((ARQUIVO_PADRAO, FONTE))
+    return {arquivo: os.stat(arquivo).st_mtime_ns for arquivo in arquivos if os.path.exists(arquivo)}
+
+
+# Estado imutável trocado de uma vez só pelo monitor; os callbacks só leem.
+# criar_app() monta o primeiro.
+estado = None
+
+
+def recarregar_se_mudou():
+    global estado
+    atuais = mtimes()
+    if atuais == estado['mtime']:
+        return False
+    if FONTE == BANCO_PADRAO and atuais.get(ARQUIVO_PADRAO) != estado['mtime'].get(ARQUIVO_PADRAO):
+        # planilha editada com o banco como fonte: leva as mudanças ao cafe.db (só as linhas alteradas)
+        from banco import importar_planilhas
+
+        importar_planilhas()
+        atuais = mtimes()
+    estado = montar_estado(estado['versao'] + 1, atuais)
+    return True
+
+
+def monitorar_planilha():
+    while True:
+        time.sleep(INTERVALO_VERIFICACAO)
+        try:
+            if recarregar_se_mudou():
+                print(f"Dados recarregados (versão {estado['versao']})")
+        except Exception as e:
+            # planilha aberta/salvando no Excel: tenta de novo na próxima volta
+            print(f"Aviso: falha ao recarregar {FONTE}: {e}")
+
+
+def opcoes_anos(anos):
+    return [{'label': str(ano), 'value': ano} for ano in anos]
+
+
+def montar_layout():
+    from dash import dcc, html
+
+    atual = estado
+    return html.Div([
+        html.H1("Dashboard Financeiro - Café Musical"),
+
+        dcc.Dropdown(
+            id='ano_dropdown',
+            options=opcoes_anos(atual['anos']),
+            value=atual['anos'][-1],
+            clearable=False
+        ),
+
+        dcc.Store(id='figuras', data=atual['figuras']),
+        dcc.Store(id='versao', data=atual['versao']),
+        dcc.Interval(id='verificar_versao', interval=INTERVALO_VERIFICACAO * 1000),
+
+        html.Div(id='graficos', children=[
+            dcc.Graph(id='grafico_compras'),
+            dcc.Graph(id='grafico_custos'),
+            dcc.Graph(id='grafico_receb')
+        ]),
+
+        html.H3("Preços em alta"),
+        html.Ul(id='altas_preco', children=atual['altas']),
+
+        html.H3("Custo por unidade e por litro"),
+        html.Table(id='ranking_custos')
+    ])
+
+
+def atualizar_dados(_, versao_cliente, ano):
+    atual = estado
+    if atual['versao'] == versao_cliente:
+        from dash.exceptions import PreventUpdate
+
+        raise PreventUpdate
+    if ano not in atual['anos']:
+        ano = atual['anos'][-1]
+    return atual['figuras'], atual['versao'], opcoes_anos(atual['anos']), ano, atual['altas']
+
+
+def atualizar_custos(ano, _):
+    return estado['custos'].get(str(ano), [])
+
+
+# troca as figuras no navegador, sem ida ao servidor
+TROCAR_FIGURAS = """
+function(ano, figuras) {
+    var figs = figuras && figuras[String(ano)];
+    if (!figs) {
+        return [window.dash_clientside.no_update, window.dash_clientside.no_update, window.dash_clientside.no_update];
+    }
+    return figs;
+}
+"""
+
+
+def criar_app():
+    """Monta o estado inicial e o app Dash com os callbacks."""
+    global estado
+    import dash
+    from dash.dependencies import Input, Output, State
+
+    estado = montar_estado(0, mtimes())
+    app = dash.Dash(__name__)
+    app.layout = montar_layout
+    app.callback(
+        [Output('figuras', 'data'),
+         Output('versao', 'data'),
+         Output('ano_dropdown', 'options'),
+         Output('ano_dropdown', 'value'),
+         Output('altas_preco', 'children')],
+        [Input('verificar_versao', 'n_intervals')],
+        [State('versao', 'data'),
+         State('ano_dropdown', 'value')]
+    )(atualizar_dados)
+    app.callback(
+        Output('ranking_custos', 'children'),
+        [Input('ano_dropdown', 'value'),
+         Input('versao', 'data')]
+    )(atualizar_custos)
+    app.clientside_callback(
+        TROCAR_FIGURAS,
+        [Output('grafico_compras', 'figure'),
+         Output('grafico_custos', 'figure'),
+         Output('grafico_receb', 'figure')],
+        [Input('ano_dropdown', 'value'),
+         Input('figuras', 'data')]
+    )
+    return app
 
-import pandas as pd
-import dash
-from dash import html, dcc
-import plotly.express as px
-
-df_compras = pd.read_excel('itens.xlsx', sheet_name='compras da semana')
-df_compras['Data'] = pd.to_datetime(df_compras['Data'])
-df_compras['Ano'] = df_compras['Data'].dt.year
-df_compras['Mes'] = df_compras['Data'].dt.month
-
-df_custos = pd.read_excel('itens.xlsx', sheet_name='CUSTOS ')
-df_custos['DATA'] = pd.to_datetime(df_custos['DATA'])
-df_custos['Ano'] = df_custos['DATA'].dt.year
-df_custos['Mes'] = df_custos['DATA'].dt.month
-
-df_receb = pd.read_excel('itens.xlsx', sheet_name='Recebimentos')
-df_receb['Data'] = pd.to_datetime(df_receb['Data'])
-df_receb['Ano'] = df_receb['Data'].dt.year
-df_receb['Mes'] = df_receb['Data'].dt.month
-
-app = dash.Dash(__name__)
-
-app.layout = html.Div([
-    html.H1("Dashboard Financeiro - Café Musical"),
-
-    dcc.Dropdown(
-        id='ano_dropdown',
-        options=[{'label': str(ano), 'value': ano} for ano in sorted(df_compras['Ano'].unique())],
-        value=sorted(df_compras['Ano'].unique())[-1],
-        clearable=False
-    ),
-
-    html.Div(id='graficos')
-])
-
-@app.callback(
-    dash.dependencies.Output('graficos', 'children'),
-    [dash.dependencies.Input('ano_dropdown', 'value')]
-)
-def atualizar_graficos(ano):
-    dados = df_compras[df_compras['Ano'] == ano]
-    custos = df_custos[df_custos['Ano'] == ano]
-    receb = df_receb[df_receb['Ano'] == ano]
-
-    total_compras = dados.groupby('Mes')['TOTAL'].sum().reset_index()
-    total_custos = custos.groupby('Mes')['VALOR'].sum().reset_index()
-    total_receb = receb.groupby('Mes')['VALOR'].sum().reset_index()
-
-    fig_compras = px.bar(total_compras, x='Mes', y='TOTAL', title='Total Comprado por Mês')
-    fig_custos = px.bar(total_custos, x='Mes', y='VALOR', title='Total Custos por Mês', color_discrete_sequence=['#E9C46A'])
-    fig_receb = px.bar(total_receb, x='Mes', y='VALOR', title='Total Recebido por Mês', color_discrete_sequence=['#2A9D8F'])
-
-    return [
-        dcc.Graph(figure=fig_compras),
-        dcc.Graph(figure=fig_custos),
-        dcc.Graph(figure=fig_receb)
-    ]
 
 if __name__ == '__main__':
+    app = criar_app()
+    threading.Thread(target=monitorar_planilha, daemon=True).start()
     app.run(debug=True)
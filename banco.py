@@ -0,0 +1,345 @@
+"""Banco SQLite local (cafe.db) com as linhas das planilhas.
+
+`cafe-report importar` lê o itens.xlsx e a contagem do estoque e grava
+cada aba numa tabela com os mesmos nomes de coluna, já tipada como em
+dados.py: dinheiro em centavos, datas AAAA-MM-DD e as colunas de
+calendário (Ano/Mes/InicioSemana/Semana).
+
+A chave de cada linha é o hash do seu conteúdo, mais o número da
+ocorrência (a mesma compra pode aparecer duas vezes no mesmo dia). As
+linhas nunca são alteradas no lugar: uma nova importação só insere as
+linhas novas e apaga as que sumiram da planilha, numa única transação.
+
+As contagens datadas da pasta Estoque vão para a tabela `contagens` e,
+junto com as compras, alimentam o razão de estoque (estoque.py). A
+tabela `historico_precos` guarda as estatísticas de preço por compra
+(precos.py).
+
+A tabela `totais` guarda as somas por dia, semana e mês, no geral e por
+tipo, item (ItemId, ver catalogo.py) e fonte. Ela é mantida na própria importação só com as
+diferenças: as linhas removidas são subtraídas e as novas somadas.
+
+Com --banco (ou com o cafe.db presente, no dashboard) o cubo sai pronto
+dessa tabela e as linhas só são carregadas quando um relatório precisa
+delas; o relatório de período lê só o intervalo, pelo índice de data.
+"""
+import os
+import sqlite3
+from collections.abc import Mapping
+
+import pandas as pd
+
+from agregacao import MEDIDAS, Cubo
+from caminhos import BANCO_PADRAO, ESTOQUE_PADRAO
+from dados import ABAS, ARQUIVO_PADRAO, VERSAO_CACHE, indexar_por_data, ler_excel
+from esquema import aplicar_esquema
+
+# tabela -> colunas indexadas (data, tipo, item); None quando a tabela não tem
+INDICES = {
+    'compras': ('Data', 'tipo', 'ItemId'),
+    'custos': ('DATA', 'TIPO', 'DESCRIÇÃO'),
+    'receb': ('Data', 'Fonte', None),
+    'vendas': ('Data', None, None),
+    'estoque': (None, None, 'ItemId'),
+    'contagens': ('Data', None, 'ItemId'),
+}
+
+COLUNAS_DATA = {'InicioSemana'} | {col for _, col in ABAS.values()}
+
+# muda quando o formato das tabelas muda; junto com dados.VERSAO_CACHE decide se o banco é refeito
+VERSAO_BANCO = 6
+
+# tabela -> dimensões com totais materializados (além do total geral, dimensão '')
+DIMENSOES = {
+    'compras': ('tipo', 'ItemId'),
+    'custos': ('TIPO', 'DESCRIÇÃO'),
+    'receb': ('Fonte',),
+}
+
+
+def aspas(nome):
+    """Nome de tabela/coluna entre aspas (as colunas da planilha têm espaço e acento)."""
+    return '"' + str(nome).replace('"', '""') + '"'
+
+
+def conectar(caminho=BANCO_PADRAO, criar=False):
+    if not criar and not os.path.exists(caminho):
+        raise FileNotFoundError(f"{caminho} não existe; rode 'cafe-report importar' antes")
+    # transações controladas à mão (BEGIN/COMMIT), inclusive para CREATE/ALTER
+    return sqlite3.connect(caminho, isolation_level=None)
+
+
+def colunas_da_tabela(con, tabela):
+    """Colunas da tabela sem a chave; vazia se a tabela não existe."""
+    return [linha[1] for linha in con.execute(f'PRAGMA table_info({aspas(tabela)})') if linha[1] != 'chave']
+
+
+def _tipo_sql(serie):
+    if pd.api.types.is_integer_dtype(serie):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(serie):
+        return 'REAL'
+    return 'TEXT'
+
+
+def _valores_sql(df):
+    """Colunas do DataFrame como listas de valores aceitos pelo sqlite3 (None para vazio)."""
+    colunas = []
+    for col in df.columns:
+        serie = df[col]
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            serie = serie.dt.strftime('%Y-%m-%d')
+        serie = serie.astype(object)
+        colunas.append(serie.where(serie.notna(), None).tolist())
+    return colunas
+
+
+def _chaves(colunas, n):
+    """Hash de cada linha como gravada no banco, mais o número da ocorrência de linhas iguais."""
+    quadro = pd.DataFrame(dict(enumerate(colunas)), index=range(n), dtype=object)
+    h = pd.util.hash_pandas_object(quadro, index=False)
+    ocorrencia = h.groupby(h).cumcount()
+    return [f'{valor:016x}-{n}' for valor, n in zip(h, ocorrencia)]
+
+
+def _preparar_tabela(con, tabela, df):
+    con.execute(f'CREATE TABLE IF NOT EXISTS {aspas(tabela)} (chave TEXT PRIMARY KEY)')
+    existentes = set(colunas_da_tabela(con, tabela))
+    for col in df.columns:
+        if col not in existentes:
+            con.execute(f'ALTER TABLE {aspas(tabela)} ADD COLUMN {aspas(col)} {_tipo_sql(df[col])}')
+    for col in INDICES[tabela]:
+        if col is not None and col in df.columns:
+            con.execute(f'CREATE INDEX IF NOT EXISTS {aspas(f"{tabela}_{col}")} ON {aspas(tabela)} ({aspas(col)})')
+
+
+def _criar_totais(con):
+    # mes usa data '' e total geral usa dimensao/categoria '' para caberem na chave primária
+    con.execute('''CREATE TABLE IF NOT EXISTS totais (
+        tabela TEXT NOT NULL, periodo TEXT NOT NULL, ano INTEGER NOT NULL, mes INTEGER NOT NULL,
+        data TEXT NOT NULL, dimensao TEXT NOT NULL, categoria TEXT NOT NULL,
+        total INTEGER NOT NULL, linhas INTEGER NOT NULL,
+        PRIMARY KEY (tabela, periodo, dimensao, ano, mes, data, categoria))''')
+
+
+def _somar_totais(con, tabela, chaves, sinal):
+    """Soma (sinal 1) ou subtrai (sinal -1) as linhas das chaves na tabela totais."""
+    con.execute('CREATE TEMP TABLE IF NOT EXISTS delta (chave TEXT PRIMARY KEY)')
+    con.execute('DELETE FROM delta')
+    con.executemany('INSERT INTO delta VALUES (?)', [(chave,) for chave in chaves])
+    colunas = set(colunas_da_tabela(con, tabela))
+    valor = aspas(MEDIDAS[tabela][1])
+    for periodo, col_periodo in (('dia', INDICES[tabela][0]), ('semana', 'InicioSemana'), ('mes', None)):
+        for dimensao in ('',) + DIMENSOES[tabela]:
+            if dimensao and dimensao not in colunas:
+                continue
+            grupo = ['Ano', 'Mes'] + [c for c in (col_periodo, dimensao) if c]
+            data = aspas(col_periodo) if col_periodo else "''"
+            categoria = aspas(dimensao) if dimensao else "''"
+            # categoria vazia fica só no total geral, como nos resumos do cubo
+            filtro = f' AND {categoria} IS NOT NULL' if dimensao else ''
+            con.execute(f'''
+                INSERT INTO totais (tabela, periodo, ano, mes, data, dimensao, categoria, total, linhas)
+                SELECT ?, ?, Ano, Mes, {data}, ?, {categoria}, ? * COALESCE(SUM({valor}), 0), ? * COUNT(*)
+                FROM {aspas(tabela)}
+                WHERE chave IN (SELECT chave FROM delta) AND Ano IS NOT NULL{filtro}
+                GROUP BY {', '.join(aspas(c) for c in grupo)}
+                ON CONFLICT (tabela, periodo, dimensao, ano, mes, data, categoria)
+                DO UPDATE SET total = total + excluded.total, linhas = linhas + excluded.linhas''',
+                (tabela, periodo, dimensao, sinal, sinal))
+    con.execute('DELETE FROM totais WHERE linhas = 0')
+
+
+def sincronizar(con, tabela, df):
+    """Deixa a tabela com as linhas do DataFrame; devolve (inseridas, removidas).
+
+    Nas abas de DIMENSOES a tabela totais recebe só a diferença.
+    """
+    _preparar_tabela(con, tabela, df)
+    valores = _valores_sql(df)
+    chaves = _chaves(valores, len(df))
+    atuais = {chave for (chave,) in con.execute(f'SELECT chave FROM {aspas(tabela)}')}
+    removidas = atuais.difference(chaves)
+    linhas = list(zip(chaves, *valores))
+    novas = [linha for linha in linhas if linha[0] not in atuais]
+
+    materializar = tabela in DIMENSOES
+    if materializar and removidas:
+        _somar_totais(con, tabela, removidas, -1)
+    con.executemany(f'DELETE FROM {aspas(tabela)} WHERE chave = ?', [(chave,) for chave in removidas])
+    if novas:
+        colunas = ', '.join(aspas(c) for c in ['chave', *df.columns])
+        marcadores = ', '.join('?' * (len(df.columns) + 1))
+        con.executemany(f'INSERT INTO {aspas(tabela)} ({colunas}) VALUES ({marcadores})', novas)
+        if materializar:
+            _somar_totais(con, tabela, [linha[0] for linha in novas], 1)
+    return len(novas), len(removidas)
+
+
+def ler_estoque(caminho=ESTOQUE_PADRAO):
+    """Contagem de estoque (primeira aba): item e quantidade."""
+    df = pd.read_excel(caminho, sheet_name=0).iloc[:, :2]
+    # o cabeçalho da primeira coluna traz o espaço para a data da contagem
+    df.columns = ['Itens', 'QUANTIDADE']
+    df['QUANTIDADE'] = pd.to_numeric(df['QUANTIDADE'], errors='coerce')
+    return df.dropna(subset=['Itens']).reset_index(drop=True)
+
+
+def _conferir_versao(con):
+    """Tabelas gravadas por outra versão do esquema são refeitas do zero."""
+    versao = f'{VERSAO_CACHE}.{VERSAO_BANCO}'
+    con.execute('CREATE TABLE IF NOT EXISTS meta (nome TEXT PRIMARY KEY, valor TEXT)')
+    linha = con.execute("SELECT valor FROM meta WHERE nome = 'versao'").fetchone()
+    if linha is None or linha[0] != versao:
+        for tabela in [*INDICES, 'totais', 'razao_estoque', 'catalogo_itens', 'historico_precos']:
+            con.execute(f'DROP TABLE IF EXISTS {aspas(tabela)}')
+        con.execute("INSERT OR REPLACE INTO meta VALUES ('versao', ?)", (versao,))
+    _criar_totais(con)
+
+
+def _gravar_catalogo(con, apelidos):
+    """Cópia da tabela de apelidos do catálogo, para as consultas por nome no banco."""
+    con.execute('''CREATE TABLE IF NOT EXISTS catalogo_itens (
+        apelido TEXT PRIMARY KEY, id INTEGER NOT NULL, nome TEXT NOT NULL)''')
+    con.execute('CREATE INDEX IF NOT EXISTS catalogo_itens_id ON catalogo_itens (id)')
+    con.execute('DELETE FROM catalogo_itens')
+    con.executemany('INSERT INTO catalogo_itens VALUES (?, ?, ?)', apelidos[['apelido', 'id', 'nome']].values.tolist())
+
+
+def importar_planilhas(caminho=ARQUIVO_PADRAO, estoque=ESTOQUE_PADRAO, banco=BANCO_PADRAO, contagens=None):
+    """Importa as abas do itens.xlsx (e o estoque, se existir); devolve {tabela: (inseridas, removidas)}.
+
+    contagens é a pasta com as planilhas de contagem (padrão: a pasta do estoque).
+    """
+    from catalogo import usar_catalogo
+    from estoque import atualizar_razao, ler_contagens
+    from precos import atualizar_historico
+
+    tabelas = ler_excel(caminho)
+    if estoque and os.path.exists(estoque):
+        tabelas['estoque'] = ler_estoque(estoque)
+    if contagens is None and estoque:
+        contagens = os.path.dirname(estoque)
+    if contagens and os.path.isdir(contagens):
+        tabelas['contagens'] = ler_contagens(contagens)
+    with usar_catalogo(caminho) as catalogo:
+        for nome in ('estoque', 'contagens'):
+            if nome in tabelas:
+                tabelas[nome]['ItemId'] = catalogo.mapear(tabelas[nome]['Itens'])
+        apelidos = catalogo.tabela()
+
+    con = conectar(banco, criar=True)
+    try:
+        con.execute('BEGIN IMMEDIATE')
+        try:
+            _conferir_versao(con)
+            resultado = {tabela: sincronizar(con, tabela, df) for tabela, df in tabelas.items()}
+            _gravar_catalogo(con, apelidos)
+            resultado['razao_estoque'] = atualizar_razao(con)
+            resultado['historico_precos'] = atualizar_historico(con)
+        except BaseException:
+            con.execute('ROLLBACK')
+            raise
+        con.execute('COMMIT')
+    finally:
+        con.close()
+    return resultado
+
+
+def ler_tabela(con, nome, inicio=None, fim=None):
+    """Linhas da tabela no mesmo formato de dados.carregar_planilhas, opcionalmente só de inicio a fim."""
+    colunas = colunas_da_tabela(con, nome)
+    if not colunas:
+        return pd.DataFrame()
+    col_data = INDICES[nome][0]
+    sql = f'SELECT {", ".join(aspas(c) for c in colunas)} FROM {aspas(nome)}'
+    params = []
+    if col_data in colunas:
+        if inicio is not None:
+            sql += f' WHERE {aspas(col_data)} BETWEEN ? AND ?'
+            params = [pd.Timestamp(inicio).strftime('%Y-%m-%d'), pd.Timestamp(fim).strftime('%Y-%m-%d')]
+        # rowid desempata na ordem em que as linhas entraram, como o sort estável de dados.py
+        sql += f' ORDER BY {aspas(col_data)}, rowid'
+
+    df = pd.read_sql_query(sql, con, params=params)
+    for col in COLUNAS_DATA.intersection(df.columns):
+        df[col] = pd.to_datetime(df[col])
+    aplicar_esquema(nome, df, em_centavos=True)
+    return indexar_por_data(nome, df) if nome in ABAS else df
+
+
+def totais(con, tabela, periodo, dimensao=''):
+    """Totais materializados: Ano, Mes, data (NaT no mês), categoria ('' no total geral), total, linhas."""
+    df = pd.read_sql_query(
+        'SELECT ano AS Ano, mes AS Mes, data, categoria, total, linhas FROM totais '
+        'WHERE tabela = ? AND periodo = ? AND dimensao = ? ORDER BY ano, mes, data, categoria',
+        con, params=(tabela, periodo, dimensao))
+    df['data'] = pd.to_datetime(df['data'].replace('', None))
+    df['total'] = df['total'].astype('Int64')
+    return df
+
+
+def cubo_do_banco(con):
+    """Cubo montado da tabela totais, sem ler as linhas."""
+    partes = {}
+    for nome, (col_cat, col_valor) in MEDIDAS.items():
+        semana = totais(con, nome, 'semana').rename(columns={'data': 'InicioSemana', 'total': col_valor})
+        mes = totais(con, nome, 'mes').rename(columns={'total': col_valor})
+        cat = totais(con, nome, 'semana', col_cat).rename(
+            columns={'data': 'InicioSemana', 'categoria': col_cat, 'total': col_valor})
+        cat_mes = totais(con, nome, 'mes', col_cat).rename(columns={'categoria': col_cat, 'total': col_valor})
+        partes[nome] = (
+            semana.set_index(['Ano', 'Mes', 'InicioSemana'])[col_valor],
+            mes.set_index(['Ano', 'Mes'])[col_valor],
+            cat.set_index(['Ano', 'Mes', 'InicioSemana', col_cat])[col_valor],
+            cat_mes.set_index(['Ano', 'Mes', col_cat])[col_valor],
+        )
+    return Cubo.de_totais(partes)
+
+
+def ranking_custos_do_banco(con, inicio, fim):
+    """Mesmo resultado de embalagens.ranking_custos, com as somas por item num GROUP BY."""
+    from embalagens import ordenar_ranking
+
+    if not colunas_da_tabela(con, 'compras'):
+        return ordenar_ranking(pd.DataFrame(columns=['ItemId', 'item', 'tipo', 'compras', 'total', 'unidades',
+                                                     'litros']))
+    # com um único MAX no SELECT, o SQLite tira Itens e tipo da mesma linha: a última compra do período
+    ranking = pd.read_sql_query('''
+        SELECT ItemId, Itens AS item, tipo, MAX(Data || printf('%012d', rowid)) AS ultima,
+               COUNT(*) AS compras, COALESCE(SUM(TOTAL), 0) AS total,
+               COALESCE(SUM(UNIDADES), 0) AS unidades, COALESCE(SUM(LITROS), 0) AS litros
+        FROM compras WHERE ItemId IS NOT NULL AND Data BETWEEN ? AND ?
+        GROUP BY ItemId ORDER BY ItemId''', con,
+        params=(pd.Timestamp(inicio).strftime('%Y-%m-%d'), pd.Timestamp(fim).strftime('%Y-%m-%d')))
+    return ordenar_ranking(ranking.drop(columns='ultima'))
+
+
+class TabelasDoBanco(Mapping):
+    """dados['compras'] etc. lidos do banco só na primeira vez que são usados.
+
+    Com inicio/fim, só as linhas desse intervalo de datas são carregadas.
+    """
+
+    def __init__(self, caminho=BANCO_PADRAO, inicio=None, fim=None):
+        self.caminho = caminho
+        self.inicio = inicio
+        self.fim = fim
+        self._tabelas = {}
+
+    def __getitem__(self, nome):
+        if nome not in ABAS:
+            raise KeyError(nome)
+        if nome not in self._tabelas:
+            con = conectar(self.caminho)
+            try:
+                self._tabelas[nome] = ler_tabela(con, nome, self.inicio, self.fim)
+            finally:
+                con.close()
+        return self._tabelas[nome]
+
+    def __iter__(self):
+        return iter(ABAS)
+
+    def __len__(self):
+        return len(ABAS)
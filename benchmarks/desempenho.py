@@ -0,0 +1,231 @@
+"""Tempos de cada etapa (leitura, cubo, gráficos, PDF, dashboard) em planilhas sintéticas.
+
+Para cada escala gera (ou reaproveita) um itens.xlsx sintético
+(planilha_sintetica.py) e mede, no mesmo processo:
+
+    leitura xlsx       dados.ler_excel, sem cache
+    cache parquet      dados.carregar_planilhas com o cache já gravado
+    cubo               agregacao.Cubo sobre as tabelas carregadas
+    importar sqlite    banco.importar_planilhas num banco novo
+    reimportar sqlite  a mesma importação sem nada mudado
+    cubo sqlite        banco.cubo_do_banco (tabela de totais)
+    gráfico barras     média por gráfico das semanas do último mês
+    gráfico pizza      pizza de custos do último mês
+    pdf mensal/anual/período
+    dash recarga       app.montar_estado (o que o monitor faz quando a planilha muda)
+    dash requisição    POST /_dash-update-component de atualizar_dados com versão
+                       nova, pelo servidor Flask de app.criar_app() (JSON das figuras incluído)
+
+Rodar da raiz do projeto:
+
+    python benchmarks/desempenho.py                      # escalas 1 e 10
+    python benchmarks/desempenho.py --escalas 1,10,100 --salvar base.json
+    python benchmarks/desempenho.py --comparar base.json # falha se alguma etapa ficou mais lenta
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from planilha_sintetica import gerar_planilha  # noqa: E402
+
+# abaixo disso a diferença é ruído de medição, não regressão
+PISO_SEGUNDOS = 0.05
+
+
+def cronometrar(func, repeticoes=1):
+    """(menor tempo em segundos, resultado da última chamada)."""
+    melhor, resultado = None, None
+    for _ in range(repeticoes):
+        t = time.perf_counter()
+        resultado = func()
+        dt = time.perf_counter() - t
+        melhor = dt if melhor is None else min(melhor, dt)
+    return melhor, resultado
+
+
+def preparar_pasta(base, escala, anos, semente):
+    pasta = os.path.join(base, f'escala_{escala:g}_anos_{anos}_semente_{semente}')
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, 'itens.xlsx')
+    if not os.path.exists(caminho):
+        t = time.perf_counter()
+        linhas = gerar_planilha(caminho + '.tmp', escala, anos, semente)
+        os.replace(caminho + '.tmp', caminho)
+        print(f"  planilha gerada em {time.perf_counter() - t:.1f} s: {linhas}")
+    shutil.copy(os.path.join(RAIZ, 'logo_cafe_musical.png'), pasta)
+    # o cache parquet é medido a cada execução
+    shutil.rmtree(os.path.join(pasta, '.cache_dados'), ignore_errors=True)
+    return pasta
+
+
+def medir_escala(pasta, repeticoes):
+    from agregacao import Cubo
+    from banco import cubo_do_banco, conectar, importar_planilhas
+    from dados import carregar_planilhas, ler_excel
+
+    tempos = {}
+    os.chdir(pasta)
+
+    tempos['leitura xlsx'], _ = cronometrar(lambda: ler_excel('itens.xlsx'))
+    carregar_planilhas('itens.xlsx')  # grava o cache
+    tempos['cache parquet'], dados = cronometrar(lambda: carregar_planilhas('itens.xlsx'), repeticoes)
+    tempos['cubo'], cubo = cronometrar(lambda: Cubo(dados['compras'], dados['custos'], dados['receb']), repeticoes)
+
+    banco = os.path.join(pasta, 'banco', 'cafe.db')
+    os.makedirs(os.path.dirname(banco), exist_ok=True)
+    if os.path.exists(banco):
+        os.remove(banco)
+    tempos['importar sqlite'], _ = cronometrar(lambda: importar_planilhas('itens.xlsx', None, banco))
+    tempos['reimportar sqlite'], _ = cronometrar(lambda: importar_planilhas('itens.xlsx', None, banco))
+    con = conectar(banco)
+    try:
+        tempos['cubo sqlite'], _ = cronometrar(lambda: cubo_do_banco(con), repeticoes)
+    finally:
+        con.close()
+
+    tempos.update(medir_relatorios(cubo, dados, repeticoes))
+    tempos.update(medir_dash(repeticoes))
+    return tempos
+
+
+def medir_relatorios(cubo, dados, repeticoes):
+    import pandas as pd
+
+    from graficos import grafico_barras, grafico_pizza
+    from relatorios import gerar_relatorio_anual, gerar_relatorio_mensal, gerar_relatorio_periodo
+
+    tempos = {}
+    ano = cubo.anos('compras')[-1]
+    mes = cubo.meses(ano, 'compras')[-1]
+    semanas = cubo.semanas(ano, mes)
+    resumos = [cubo.resumo('compras', ano, mes, semana) for semana in semanas]
+    # o primeiro gráfico paga o import do matplotlib; não entra na conta
+    grafico_barras(resumos[0], 'aquecimento', 'tipo', 'TOTAL')
+
+    dt, _ = cronometrar(lambda: [grafico_barras(r, 'Compras', 'tipo', 'TOTAL') for r in resumos], repeticoes)
+    tempos['gráfico barras'] = dt / len(resumos)
+    resumo_custos = cubo.resumo('custos', ano, mes)
+    tempos['gráfico pizza'], _ = cronometrar(lambda: grafico_pizza(resumo_custos, 'Custos', 'VALOR', 'TIPO'), repeticoes)
+
+    saida = os.path.join(os.getcwd(), 'relatorios')
+    fim = dados['compras']['Data'].max()
+    inicio = fim - pd.Timedelta(days=27)
+    with contextlib.redirect_stdout(io.StringIO()):
+        tempos['pdf mensal'], _ = cronometrar(lambda: gerar_relatorio_mensal(cubo, ano, mes, saida), repeticoes)
+        tempos['pdf anual'], _ = cronometrar(lambda: gerar_relatorio_anual(cubo, ano, saida), repeticoes)
+        tempos['pdf período'], _ = cronometrar(
+            lambda: gerar_relatorio_periodo(dados['compras'], dados['custos'], dados['receb'], inicio, fim, saida),
+            repeticoes)
+    return tempos
+
+
+# saídas do callback app.atualizar_dados, na ordem registrada em app.criar_app
+SAIDAS_DASH = [('figuras', 'data'), ('versao', 'data'), ('ano_dropdown', 'options'),
+               ('ano_dropdown', 'value'), ('altas_preco', 'children')]
+
+
+def requisicao_dash(ano, versao_cliente):
+    """Corpo do POST que o navegador manda quando o Interval dispara atualizar_dados."""
+    return {
+        'output': '..' + '...'.join(f'{id_}.{prop}' for id_, prop in SAIDAS_DASH) + '..',
+        'outputs': [{'id': id_, 'property': prop} for id_, prop in SAIDAS_DASH],
+        'inputs': [{'id': 'verificar_versao', 'property': 'n_intervals', 'value': 1}],
+        'state': [{'id': 'versao', 'property': 'data', 'value': versao_cliente},
+                  {'id': 'ano_dropdown', 'property': 'value', 'value': ano}],
+        'changedPropIds': ['verificar_versao.n_intervals'],
+    }
+
+
+def medir_dash(repeticoes):
+    import app
+
+    # criar_app monta o estado inicial a partir do itens.xlsx da pasta atual; o monitor
+    # não é iniciado: quem troca o estado aqui é o benchmark
+    with contextlib.redirect_stdout(io.StringIO()):
+        servidor = app.criar_app().server
+
+    tempos = {}
+    versao = app.estado['versao'] + 1
+    tempos['dash recarga'], estado = cronometrar(lambda: app.montar_estado(versao, 0), repeticoes)
+    app.estado = estado
+    # a requisição inteira (roteamento, callback, serialização das figuras), não só a função
+    cliente = servidor.test_client()
+    corpo = requisicao_dash(estado['anos'][-1], versao - 1)
+
+    def requisitar():
+        resposta = cliente.post('/_dash-update-component', json=corpo)
+        if resposta.status_code != 200:
+            raise RuntimeError(f"dash respondeu {resposta.status_code}: {resposta.get_data(as_text=True)[:200]}")
+        return resposta
+
+    tempos['dash requisição'], _ = cronometrar(requisitar, repeticoes)
+    return tempos
+
+
+def imprimir(resultados):
+    escalas = list(resultados)
+    etapas = list(next(iter(resultados.values())))
+    print(f"\n{'etapa':<20}" + ''.join(f"{f'{e}x':>12}" for e in escalas))
+    for etapa in etapas:
+        print(f"{etapa:<20}" + ''.join(f"{resultados[e][etapa] * 1000:>10.1f}ms" for e in escalas))
+
+
+def comparar(resultados, base, tolerancia):
+    """Etapas mais lentas que a base além da tolerância; devolve o número de regressões."""
+    regressoes = 0
+    for escala, tempos in resultados.items():
+        for etapa, dt in tempos.items():
+            anterior = base.get(escala, {}).get(etapa)
+            if anterior is None:
+                continue
+            if dt > anterior * (1 + tolerancia) and dt - anterior > PISO_SEGUNDOS:
+                regressoes += 1
+                print(f"REGRESSÃO {escala}x {etapa}: {anterior * 1000:.1f} ms -> {dt * 1000:.1f} ms")
+    if not regressoes:
+        print("Nenhuma regressão em relação à base.")
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--escalas', default='1,10', help='escalas separadas por vírgula (padrão: %(default)s)')
+    parser.add_argument('--anos', type=int, default=2)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--repeticoes', type=int, default=3, help='vale o menor tempo (leituras rodam uma vez)')
+    parser.add_argument('--pasta', default=os.path.join(tempfile.gettempdir(), 'cafe_benchmarks'),
+                        help='onde guardar as planilhas geradas (padrão: %(default)s)')
+    parser.add_argument('--salvar', help='grava os tempos em JSON')
+    parser.add_argument('--comparar', help='JSON de uma execução anterior (--salvar)')
+    parser.add_argument('--tolerancia', type=float, default=0.3, help='folga aceita sobre a base (padrão: 30%%)')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    resultados = {}
+    for escala in [float(e) for e in args.escalas.split(',')]:
+        chave = f'{escala:g}'
+        print(f"Escala {chave}x:")
+        pasta = preparar_pasta(os.path.abspath(args.pasta), escala, args.anos, args.semente)
+        resultados[chave] = medir_escala(pasta, args.repeticoes)
+    os.chdir(RAIZ)
+
+    imprimir(resultados)
+    if args.salvar:
+        with open(args.salvar, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=1)
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            return 1 if comparar(resultados, json.load(f), args.tolerancia) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
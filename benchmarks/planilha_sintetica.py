@@ -0,0 +1,125 @@
+"""Gera um itens.xlsx sintético com as mesmas abas e colunas do real.
+
+A escala 1 corresponde ao volume atual da loja (~55 compras, 2
+recebimentos e alguns custos por semana); a escala N multiplica o número
+de linhas por semana. Por padrão são dois anos, para passar pela virada
+de ano. Os valores são aleatórios mas reprodutíveis (semente fixa). Uso,
+da raiz do projeto:
+
+    python benchmarks/planilha_sintetica.py /tmp/itens_10x.xlsx --escala 10
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import zipfile
+
+COMPRAS_POR_SEMANA = 55
+INICIO = datetime.date(2025, 1, 5)  # um domingo
+
+TIPOS = ['CERVEJA', 'COMIDA', 'FEIJOADA', 'DESTILADOS', 'REFRIGERANTE ', 'UTENSÍLIOS', 'LIMPEZA',
+         'AGUA', 'BEBIDAS ', 'CAFÉ', 'SUCO', 'BALAS ', 'SALGADO', 'FRUTAS']
+# (descrição, tipo, frequência) lançados todo mês
+CUSTOS_MENSAIS = [('CONTADOR ', 'CONTADOR ', 'MENSAL '), ('LUZ', 'LUZ', 'MENSAL '),
+                  ('SIMPLES NACIONAL', 'IMPOSTOS', 'MENSAL '), ('INSS ', 'IMPOSTOS', 'MENSAL '),
+                  ('salario', 'SALARIOS', 'MENSAL ')]
+FONTES = ['FEIJOADA ', 'LANCHONETE']
+
+
+def _itens(rng, quantidade):
+    """Catálogo fixo de itens (nome, tipo, preço unitário)."""
+    return [(f'{tipo.strip()} ITEM {n:04d}', tipo, round(rng.uniform(2, 180), 2))
+            for n, tipo in enumerate(rng.choice(TIPOS) for _ in range(quantidade))]
+
+
+def _gravar_dimensoes(caminho, dimensoes):
+    """Acrescenta o <dimension> de cada aba, que o Excel sempre grava e o write_only não.
+
+    Sem ele o openpyxl em read_only percorre a aba inteira só para
+    descobrir o tamanho, e a leitura medida deixaria de ser a do arquivo real.
+    """
+    temporario = caminho + '.dim'
+    with zipfile.ZipFile(caminho) as origem, zipfile.ZipFile(temporario, 'w', zipfile.ZIP_DEFLATED) as destino:
+        for entrada in origem.infolist():
+            conteudo = origem.read(entrada)
+            nome = os.path.basename(entrada.filename)
+            if nome in dimensoes:
+                conteudo = conteudo.replace(b'<sheetViews>', f'<dimension ref="{dimensoes[nome]}" /><sheetViews>'.encode(), 1)
+            destino.writestr(entrada, conteudo)
+    os.replace(temporario, caminho)
+
+
+def gerar_planilha(caminho, escala=1, anos=2, semente=0):
+    """Grava o workbook e devolve {aba: nº de linhas}."""
+    from openpyxl import Workbook
+
+    rng = random.Random(semente)
+    itens = _itens(rng, 400 * max(1, int(escala ** 0.5)))
+    semanas = 52 * anos
+    wb = Workbook(write_only=True)
+
+    compras = wb.create_sheet('compras da semana')
+    compras.append(['Itens', 'tipo', 'QUANTIDADE', 'Data', 'VALOR UND', 'DESCONTO', 'TOTAL'])
+    n_compras = 0
+    for semana in range(semanas):
+        domingo = INICIO + datetime.timedelta(weeks=semana)
+        for _ in range(round(COMPRAS_POR_SEMANA * escala)):
+            nome, tipo, preco = rng.choice(itens)
+            quantidade = rng.choice([1, 1, 1, 2, 2, 3, 4, 6, 12])
+            valor_und = round(preco * rng.uniform(0.9, 1.15), 2)
+            desconto = round(valor_und * quantidade * 0.05, 2) if rng.random() < 0.05 else None
+            total = round(valor_und * quantidade - (desconto or 0), 2)
+            data = datetime.datetime.combine(domingo + datetime.timedelta(days=rng.randrange(7)), datetime.time())
+            compras.append([nome, tipo, quantidade, data, valor_und, desconto, total])
+            n_compras += 1
+
+    custos = wb.create_sheet('CUSTOS ')
+    custos.append(['DESCRIÇÃO', 'TIPO', 'FREQUENCIA', 'DATA', 'VALOR'])
+    n_custos = 0
+    for mes in range(12 * anos):
+        ano, mes_do_ano = INICIO.year + mes // 12, mes % 12 + 1
+        for copia in range(max(1, round(escala))):
+            for descricao, tipo, frequencia in CUSTOS_MENSAIS:
+                sufixo = f' {copia}' if copia else ''
+                data = datetime.datetime(ano, mes_do_ano, rng.randint(1, 28))
+                custos.append([descricao + sufixo, tipo, frequencia, data, round(rng.uniform(500, 5000), 2)])
+                n_custos += 1
+    for semana in range(semanas):
+        sabado = INICIO + datetime.timedelta(weeks=semana, days=6)
+        custos.append(['EQUIPE FEIJOADA ', 'EQUIPE FEIJOADA ', 'SEMANAL',
+                       datetime.datetime.combine(sabado, datetime.time()), round(rng.uniform(800, 1500), 2)])
+        n_custos += 1
+
+    receb = wb.create_sheet('Recebimentos')
+    receb.append(['Data', 'Fonte', 'VALOR'])
+    n_receb = 0
+    for semana in range(semanas):
+        sabado = datetime.datetime.combine(INICIO + datetime.timedelta(weeks=semana, days=6), datetime.time())
+        for _ in range(max(1, round(escala))):
+            for fonte in FONTES:
+                receb.append([sabado, fonte, round(rng.uniform(2000, 45000), 2)])
+                n_receb += 1
+
+    # a aba de vendas existe no arquivo real, mas ainda vazia
+    wb.create_sheet('VENDAS ')
+    wb.save(caminho)
+    _gravar_dimensoes(caminho, {'sheet1.xml': f'A1:G{n_compras + 1}', 'sheet2.xml': f'A1:E{n_custos + 1}',
+                                'sheet3.xml': f'A1:C{n_receb + 1}', 'sheet4.xml': 'A1'})
+    return {'compras': n_compras, 'custos': n_custos, 'receb': n_receb, 'vendas': 0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('caminho')
+    parser.add_argument('--escala', type=float, default=1)
+    parser.add_argument('--anos', type=int, default=2)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+    linhas = gerar_planilha(args.caminho, args.escala, args.anos, args.semente)
+    print(f"{args.caminho}: " + ', '.join(f'{aba} {n}' for aba, n in linhas.items()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
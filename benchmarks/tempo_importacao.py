@@ -0,0 +1,70 @@
+"""Orçamento de tempo de inicialização dos pontos de entrada.
+
+Cada caso roda num interpretador novo (várias vezes, vale o menor tempo)
+e falha se passar do orçamento ou se carregar um módulo pesado que não
+deveria ser importado naquele caminho. Rodar da raiz do projeto:
+
+    python benchmarks/tempo_importacao.py
+    python benchmarks/tempo_importacao.py --fator 2   # máquina mais lenta
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (nome, código, orçamento em segundos, módulos que não podem ter sido carregados)
+CASOS = [
+    ('import dados', 'import dados', 0.8, ['fpdf', 'matplotlib', 'dash', 'plotly']),
+    ('import cafe_report', 'import cafe_report', 0.3, ['pandas', 'fpdf', 'matplotlib', 'dash', 'plotly']),
+    ('import lote', 'import lote', 0.8, ['fpdf', 'matplotlib']),
+    ('import app', 'import app', 0.3, ['pandas', 'dash', 'plotly']),
+    ('cafe-report --help', 'import cafe_report; cafe_report.main(["--help"])', 0.3, ['pandas', 'plotly', 'fpdf', 'matplotlib']),
+    ('cafe-report --check', 'import cafe_report; cafe_report.main(["--check"])', 1.5, ['fpdf', 'matplotlib']),
+]
+
+MEDIDOR = """
+import sys, time
+t = time.perf_counter()
+try:
+    {codigo}
+except SystemExit:
+    pass
+dt = time.perf_counter() - t
+proibidos = [m for m in {proibidos!r} if m in sys.modules]
+print('@@', dt, ','.join(proibidos))
+"""
+
+
+def medir(codigo, proibidos, repeticoes):
+    melhor, carregados = None, []
+    for _ in range(repeticoes):
+        script = MEDIDOR.format(codigo=codigo, proibidos=proibidos)
+        saida = subprocess.run([sys.executable, '-c', script], cwd=RAIZ, capture_output=True, text=True, check=True).stdout
+        linha = [l for l in saida.splitlines() if l.startswith('@@')][-1].split(' ', 2)
+        dt = float(linha[1])
+        carregados = [m for m in linha[2].split(',') if m] if len(linha) > 2 else []
+        melhor = dt if melhor is None else min(melhor, dt)
+    return melhor, carregados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--fator', type=float, default=1.0, help='multiplica todos os orçamentos')
+    args = parser.parse_args(argv)
+
+    falhas = 0
+    for nome, codigo, orcamento, proibidos in CASOS:
+        dt, carregados = medir(codigo, proibidos, args.repeticoes)
+        limite = orcamento * args.fator
+        ok = dt <= limite and not carregados
+        falhas += not ok
+        extra = f"  carregou {', '.join(carregados)}" if carregados else ''
+        print(f"{'OK   ' if ok else 'FALHA'} {nome:<22} {dt:6.3f} s (orçamento {limite:.2f} s){extra}")
+    return 1 if falhas else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""cafe-report: ponto de entrada único para os relatórios em PDF.
+
+Carrega a planilha uma vez e gera quantos relatórios forem pedidos no
+mesmo processo, sem pausas no final (dá para agendar no cron / Agendador
+de Tarefas). Exemplos:
+
+    python cafe_report.py mensal --ano 2025 --mes 5
+    python cafe_report.py anual
+    python cafe_report.py semanal --data 2025-05-14
+    python cafe_report.py periodo --inicio 24/04/2025 --fim 17/05/2025
+    python cafe_report.py todos --incremental
+    python cafe_report.py --check
+    python cafe_report.py --check outra_planilha.xlsx
+    python cafe_report.py importar
+    python cafe_report.py todos --banco
+    python cafe_report.py estoque --item "HEINEKEN 330ML" --data 2025-06-20
+
+`importar` grava as abas no banco SQLite (banco.py); com --banco os
+relatórios consultam o banco em vez de ler a planilha inteira. `estoque`
+consulta o razão de estoque do banco (estoque.py).
+
+Os módulos pesados só são importados quando usados: pandas ao carregar
+os dados, fpdf e matplotlib quando há PDF para gerar. O --help não
+carrega nenhum deles; benchmarks/tempo_importacao.py confere o orçamento.
+
+Com --metricas (ou CAFE_METRICAS=arquivo.jsonl) cada execução e cada
+relatório deixam uma linha com o tempo por etapa no arquivo; --perfil
+grava o perfil de cada relatório em perfis/ e as métricas em
+relatorio_metricas.jsonl (ver medicao.py). Sem nada disso, nenhum
+arquivo de métricas é escrito.
+"""
+import argparse
+import os
+import sys
+import traceback
+
+from caminhos import ARQUIVO_PADRAO, BANCO_PADRAO, ESTOQUE_PADRAO
+from medicao import ARQUIVO_METRICAS, Cronometro
+
+
+def data_arg(texto):
+    """Aceita AAAA-MM-DD ou DD/MM/AAAA."""
+    import pandas as pd
+
+    try:
+        if '/' in texto:
+            return pd.to_datetime(texto, format='%d/%m/%Y')
+        return pd.to_datetime(texto, format='%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data inválida: {texto!r} (use AAAA-MM-DD ou DD/MM/AAAA)")
+
+
+def criar_parser():
+    # opções comuns vão em cada subcomando: cafe-report mensal --incremental
+    comum = argparse.ArgumentParser(add_help=False)
+    comum.add_argument('--arquivo', default=ARQUIVO_PADRAO, help='planilha de origem (padrão: %(default)s)')
+    comum.add_argument('--saida', default='relatorios', help='pasta dos PDFs (padrão: %(default)s)')
+    comum.add_argument('--processos', type=int, default=None, help='processos em paralelo (padrão: nº de núcleos)')
+    comum.add_argument('--incremental', action='store_true', help='só refaz os PDFs cujos dados mudaram')
+    comum.add_argument('--pausar', action='store_true', help='espera Enter no final (uso com duplo clique)')
+    comum.add_argument('--banco', nargs='?', const=BANCO_PADRAO, default=None, metavar='CAMINHO',
+                       help='lê do banco SQLite em vez da planilha (sem caminho: %(const)s)')
+    comum.add_argument('--perfil', nargs='?', const='cprofile', choices=['cprofile', 'pyinstrument'],
+                       help='grava o perfil de cada relatório em perfis/ (padrão: %(const)s)')
+    comum.add_argument('--metricas', nargs='?', const=ARQUIVO_METRICAS, default=os.environ.get('CAFE_METRICAS'),
+                       metavar='ARQUIVO', help='grava o tempo por etapa em ARQUIVO.jsonl (sem caminho: %(const)s)')
+
+    parser = argparse.ArgumentParser(prog='cafe-report', description='Relatórios em PDF do Café Musical.')
+    parser.add_argument('--check', nargs='?', const=ARQUIVO_PADRAO, metavar='ARQUIVO',
+                        help='só valida a planilha, sem gerar relatórios (sem caminho: %(const)s)')
+    sub = parser.add_subparsers(dest='comando')
+
+    p = sub.add_parser('mensal', parents=[comum], help='relatórios mensais (semanas, custos e recebimentos do mês)')
+    p.add_argument('--ano', type=int, help='só este ano (padrão: todos)')
+    p.add_argument('--mes', type=int, choices=range(1, 13), metavar='MES', help='só este mês (1-12)')
+
+    p = sub.add_parser('anual', parents=[comum], help='relatórios anuais')
+    p.add_argument('--ano', type=int, help='só este ano (padrão: todos)')
+
+    p = sub.add_parser('semanal', parents=[comum], help='relatório de uma semana (domingo a sábado)')
+    p.add_argument('--data', type=data_arg, help='qualquer dia da semana (padrão: última compra registrada)')
+
+    p = sub.add_parser('periodo', parents=[comum], help='relatório de um intervalo de datas')
+    p.add_argument('--inicio', type=data_arg, required=True)
+    p.add_argument('--fim', type=data_arg, required=True)
+
+    sub.add_parser('todos', parents=[comum], help='todos os mensais e anuais')
+
+    p = sub.add_parser('importar', help='importa a planilha e o estoque para o banco SQLite')
+    p.add_argument('--arquivo', default=ARQUIVO_PADRAO, help='planilha de origem (padrão: %(default)s)')
+    p.add_argument('--estoque', default=ESTOQUE_PADRAO, help='contagem de estoque (padrão: %(default)s)')
+    p.add_argument('--banco', default=BANCO_PADRAO, help='arquivo do banco (padrão: %(default)s)')
+
+    p = sub.add_parser('estoque', help='estoque no fim de um dia, pelo razão do banco (rode importar antes)')
+    p.add_argument('--item', help='só este item (padrão: todos com contagem)')
+    p.add_argument('--data', type=data_arg, help='dia da posição (padrão: hoje)')
+    p.add_argument('--banco', default=BANCO_PADRAO, help='arquivo do banco (padrão: %(default)s)')
+    return parser
+
+
+class SemDados(Exception):
+    """Os dados carregados não bastam para o comando pedido."""
+
+
+def montar_tarefas(args, cubo):
+    if args.comando == 'todos':
+        from lote import tarefas_padrao
+
+        return tarefas_padrao(cubo)
+
+    anos = cubo.anos('compras')
+    if getattr(args, 'ano', None) is not None:
+        anos = [a for a in anos if a == args.ano]
+
+    if args.comando == 'mensal':
+        return [('mensal', ano, mes) for ano in anos for mes in cubo.meses(ano, 'compras')
+                if args.mes is None or mes == args.mes]
+    if args.comando == 'anual':
+        return [('anual', ano) for ano in anos]
+    if args.comando == 'semanal':
+        from calendario import semana_da_data
+
+        # sem --data: a semana da última compra registrada
+        data = args.data
+        if data is None:
+            if not cubo.total_semana['compras']:
+                raise SemDados("nenhuma compra registrada para escolher a semana; informe --data")
+            data = max(s for _, _, s in cubo.total_semana['compras'])
+        return [('periodo', *semana_da_data(data))]
+    if args.comando == 'periodo':
+        return [('periodo', args.inicio, args.fim)]
+    raise ValueError(args.comando)
+
+
+def carregar(args, cronometro):
+    """(cubo, tarefas, dados) lidos da planilha ou, com --banco, do SQLite."""
+    from agregacao import Cubo
+
+    if args.banco is None:
+        from dados import carregar_planilhas
+
+        dados = carregar_planilhas(args.arquivo)
+        cronometro.marcar('carga')
+        cubo = Cubo(dados['compras'], dados['custos'], dados['receb'])
+        cronometro.marcar('cubo')
+        return cubo, montar_tarefas(args, cubo), dados
+
+    import pandas as pd
+
+    from banco import TabelasDoBanco, conectar, cubo_do_banco
+    from precos import JANELA_DIAS
+
+    con = conectar(args.banco)
+    try:
+        cubo = cubo_do_banco(con)
+    finally:
+        con.close()
+    cronometro.marcar('cubo')
+    tarefas = montar_tarefas(args, cubo)
+    if tarefas and all(t[0] == 'periodo' for t in tarefas):
+        # relatório de período: só as linhas do intervalo (e da janela de preços antes dele) saem do banco
+        inicio = min(t[1] for t in tarefas) - pd.Timedelta(days=JANELA_DIAS)
+        return cubo, tarefas, TabelasDoBanco(args.banco, inicio, max(t[2] for t in tarefas))
+    return cubo, tarefas, TabelasDoBanco(args.banco)
+
+
+def importar(args):
+    from banco import importar_planilhas
+
+    resultado = importar_planilhas(args.arquivo, args.estoque, args.banco)
+    for tabela, (inseridas, removidas) in resultado.items():
+        print(f"{tabela}: {inseridas} linha(s) nova(s), {removidas} removida(s)")
+    print(f"Banco atualizado: {args.banco}")
+
+
+def consultar_estoque(args):
+    import pandas as pd
+
+    from banco import conectar
+    from estoque import posicao_em, saldo_em
+
+    data = args.data if args.data is not None else pd.Timestamp.today().normalize()
+    con = conectar(args.banco)
+    try:
+        if args.item:
+            saldo = saldo_em(con, args.item, data)
+            if saldo is None:
+                print(f"{args.item.strip()}: sem contagem até {data.strftime('%d/%m/%Y')}")
+            else:
+                print(f"{args.item.strip()}: {saldo:g}")
+            return 0
+        posicao = posicao_em(con, data)
+    finally:
+        con.close()
+    print(f"Estoque em {data.strftime('%d/%m/%Y')}:")
+    for _, item, saldo, ultimo in posicao.itertuples(index=False):
+        print(f"- {item}: {saldo:g} (último movimento {ultimo.strftime('%d/%m/%Y')})")
+    return 0
+
+
+def checar(arquivo):
+    from dados import carregar_planilhas, validar_planilhas
+
+    problemas = validar_planilhas(carregar_planilhas(arquivo))
+    for problema in problemas:
+        print(f"- {problema}")
+    print(f"{arquivo}: {len(problemas)} problema(s) encontrado(s)." if problemas else f"{arquivo}: OK")
+    return 1 if problemas else 0
+
+
+def main(argv=None):
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    if args.check:
+        return checar(args.check)
+    if args.comando is None:
+        parser.error('informe um comando ou --check')
+
+    if args.comando == 'importar':
+        importar(args)
+        return 0
+    if args.comando == 'estoque':
+        return consultar_estoque(args)
+
+    from lote import gerar_em_lote
+
+    metricas = args.metricas
+    if args.perfil:
+        # variável de ambiente: chega também aos processos do lote
+        os.environ['CAFE_PERFIL'] = args.perfil
+        metricas = metricas or ARQUIVO_METRICAS
+    if metricas:
+        # caminho absoluto: os processos do lote gravam no mesmo arquivo
+        metricas = os.path.abspath(metricas)
+
+    codigo = 0
+    cronometro = Cronometro('execucao', metricas, comando=args.comando, banco=args.banco is not None)
+    try:
+        cubo, tarefas, dados = carregar(args, cronometro)
+        if not tarefas:
+            print("Nenhum dado para os filtros informados.")
+        resultado = gerar_em_lote(cubo, dados, tarefas, args.saida, args.processos, args.incremental, metricas)
+        cronometro.marcar('relatorios')
+        erros = sum(1 for _, erro in resultado if erro)
+        cronometro.registrar(tarefas=len(tarefas), gerados=len(resultado) - erros, erros=erros)
+        if erros:
+            codigo = 1
+    except SemDados as e:
+        print(f"{args.banco or args.arquivo}: {e}")
+        codigo = 1
+    except Exception:
+        from relatorios import log_erro
+
+        log_erro(traceback.format_exc())
+        codigo = 1
+
+    if args.pausar:
+        input("Pressione Enter para sair...")
+    return codigo
+
+
+if __name__ == '__main__':
+    sys.exit(main())
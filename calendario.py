@@ -0,0 +1,64 @@
+"""Colunas de calendário calculadas de forma vetorizada (datetime64 do NumPy).
+
+Todas as semanas dos relatórios vão de domingo a sábado. Para cada data:
+    InicioSemana  domingo que abre a semana
+    Semana        número ISO da semana (o da segunda-feira seguinte ao
+                  domingo, para que os 7 dias da semana tenham o mesmo número)
+    Ano, Mes      ano e mês da própria data
+"""
+import numpy as np
+import pandas as pd
+
+# 01/01/1970 foi uma quinta-feira
+_DESLOC_DOMINGO = 4  # dias desde o domingo anterior
+_DESLOC_SEGUNDA = 3  # dias desde a segunda anterior
+
+
+def _dias(datas):
+    return np.asarray(datas, dtype='datetime64[ns]').astype('datetime64[D]')
+
+
+def inicio_semana(datas):
+    """Domingo que abre a semana de cada data (datetime64[D])."""
+    dias = _dias(datas)
+    desde_domingo = (dias.astype('int64') + _DESLOC_DOMINGO) % 7
+    return dias - desde_domingo.astype('timedelta64[D]')
+
+
+def semana_iso(datas):
+    """Número ISO da semana de cada data."""
+    dias = _dias(datas)
+    desde_segunda = (dias.astype('int64') + _DESLOC_SEGUNDA) % 7
+    quinta = dias - desde_segunda.astype('timedelta64[D]') + np.timedelta64(3, 'D')
+    dia_do_ano = (quinta - quinta.astype('datetime64[Y]')).astype('int64')
+    return dia_do_ano // 7 + 1
+
+
+def _com_nulos(valores, nulos, dtype):
+    # datas vazias viram NaN, como em Series.dt.year
+    if nulos.any():
+        valores = valores.astype('float64')
+        valores[nulos] = np.nan
+        return valores
+    return valores.astype(dtype)
+
+
+def adicionar_colunas(df, col_data):
+    """Acrescenta InicioSemana, Semana, Ano e Mes a partir de col_data (in place)."""
+    datas = df[col_data].to_numpy(dtype='datetime64[ns]')
+    nulos = np.isnat(datas)
+    dias = datas.astype('datetime64[D]')
+    meses = dias.astype('datetime64[M]').astype('int64')
+    inicio = inicio_semana(datas)
+
+    df['Ano'] = _com_nulos(meses // 12 + 1970, nulos, 'int32')
+    df['Mes'] = _com_nulos(meses % 12 + 1, nulos, 'int32')
+    df['InicioSemana'] = pd.to_datetime(inicio)
+    df['Semana'] = _com_nulos(semana_iso(inicio + np.timedelta64(1, 'D')), nulos, 'int64')
+    return df
+
+
+def semana_da_data(data):
+    """(domingo, sábado) da semana que contém a data."""
+    inicio = pd.Timestamp(inicio_semana([pd.Timestamp(data).to_datetime64()])[0])
+    return inicio, inicio + pd.Timedelta(days=6)
@@ -0,0 +1,10 @@
+"""Caminhos padrão dos arquivos do Café Musical.
+
+Módulo sem dependências: cafe_report.py monta o parser (e o --help) e
+app.py escolhe a fonte dos dados sem importar pandas.
+"""
+import os
+
+ARQUIVO_PADRAO = 'itens.xlsx'
+BANCO_PADRAO = 'cafe.db'
+ESTOQUE_PADRAO = os.path.join('Estoque', 'controle de estoque.xlsx')
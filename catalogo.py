@@ -0,0 +1,179 @@
+"""Catálogo de itens: cada nome de item da planilha vira um id inteiro.
+
+O mesmo produto aparece com nomes diferentes ('STELLA LOG NECK 330ML',
+'(PROMO) STELLA LOG NECK 330ML', 'CACHAÇA SELETA 1L ' e 'CACHACA
+SELETA 1L'). O catálogo (catalogo_itens.json, ao lado da planilha) guarda
+os itens canônicos (id, nome) e a tabela de apelidos: nome exatamente
+como veio da planilha -> id. Um nome já visto é só uma busca no
+dicionário; só nomes novos passam pela normalização:
+
+1. chave: maiúsculas, sem acento, sem '(PROMO)', espaços colapsados;
+2. chave solta: sem DE/DA/DO/E e sem o plural ('SACOS DE GELO' = 'SACO DE GELO');
+3. erro de digitação: uma única palavra diferente, parecida e com 5+
+   letras, mesmos números e mesmo número de palavras. Nomes que diferem
+   em sabor, cor ou tamanho ('CAJA'/'CAJU', 'COM GAS'/'SEM GAS',
+   '0,5KG'/'1KG') continuam separados.
+
+Se nada casar, o nome ganha um id novo. Os ids nunca mudam; para juntar
+dois itens à mão, aponte o apelido para o outro id no JSON.
+"""
+import contextlib
+import difflib
+import json
+import os
+import re
+import time
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+CATALOGO_PADRAO = 'catalogo_itens.json'
+VERSAO_CATALOGO = 1
+
+PALAVRAS_IGNORADAS = {'DE', 'DA', 'DO', 'DAS', 'DOS', 'E'}
+_PROMO = re.compile(r'^\(\s*PROMO\s*\)\s*', re.IGNORECASE)
+_NUMEROS = re.compile(r'\d+')
+
+
+def normalizar(nome):
+    """Chave de comparação: maiúsculas, sem acento, sem '(PROMO)', espaços simples."""
+    texto = unicodedata.normalize('NFKD', str(nome).upper())
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(_PROMO.sub('', texto.strip()).split())
+
+
+def _chave_solta(chave):
+    palavras = [p for p in chave.split() if p not in PALAVRAS_IGNORADAS]
+    return ' '.join(p[:-1] if len(p) > 3 and p.isalpha() and p.endswith('S') else p for p in palavras)
+
+
+def _erro_de_digitacao(a, b):
+    """a e b diferem numa única palavra, com 5+ letras e quase igual, e têm os mesmos números."""
+    pa, pb = a.split(), b.split()
+    if len(pa) != len(pb) or _NUMEROS.findall(a) != _NUMEROS.findall(b):
+        return False
+    diferentes = [(x, y) for x, y in zip(pa, pb) if x != y]
+    if len(diferentes) != 1:
+        return False
+    x, y = diferentes[0]
+    return min(len(x), len(y)) >= 5 and difflib.SequenceMatcher(None, x, y).ratio() >= 0.8
+
+
+def caminho_catalogo(planilha):
+    return os.path.join(os.path.dirname(os.path.abspath(planilha)), CATALOGO_PADRAO)
+
+
+class Catalogo:
+    def __init__(self, caminho=None, nomes=None, apelidos=None):
+        self.caminho = caminho
+        self.nomes = dict(nomes or {})        # id -> nome canônico
+        self.apelidos = dict(apelidos or {})  # nome cru -> id
+        self.alterado = False
+        self._chaves = {}
+        self._soltas = {}
+        for id_, nome in sorted(self.nomes.items()):
+            self._indexar(normalizar(nome), id_)
+
+    @classmethod
+    def abrir(cls, caminho):
+        try:
+            with open(caminho, encoding='utf-8') as f:
+                conteudo = json.load(f)
+        except FileNotFoundError:
+            return cls(caminho)
+        nomes = {int(id_): nome for id_, nome in conteudo['itens'].items()}
+        return cls(caminho, nomes, conteudo['apelidos'])
+
+    def salvar(self):
+        if not self.alterado or self.caminho is None:
+            return
+        conteudo = {
+            'versao': VERSAO_CATALOGO,
+            'itens': {str(id_): nome for id_, nome in sorted(self.nomes.items())},
+            'apelidos': dict(sorted(self.apelidos.items())),
+        }
+        tmp = self.caminho + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(conteudo, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.caminho)
+        self.alterado = False
+
+    def _indexar(self, chave, id_):
+        self._chaves.setdefault(chave, id_)
+        self._soltas.setdefault(_chave_solta(chave), id_)
+
+    def _procurar(self, chave):
+        if chave in self._chaves:
+            return self._chaves[chave]
+        solta = _chave_solta(chave)
+        if solta in self._soltas:
+            return self._soltas[solta]
+        for parecida in difflib.get_close_matches(chave, self._chaves, n=3, cutoff=0.85):
+            if _erro_de_digitacao(chave, parecida):
+                return self._chaves[parecida]
+        return None
+
+    def id_de(self, nome):
+        """Id do item; nomes nunca vistos são normalizados e, se preciso, ganham id novo."""
+        nome = str(nome)
+        id_ = self.apelidos.get(nome)
+        if id_ is not None:
+            return id_
+        chave = normalizar(nome)
+        id_ = self._procurar(chave)
+        if id_ is None:
+            id_ = max(self.nomes, default=0) + 1
+            self.nomes[id_] = _PROMO.sub('', nome.strip())
+        self._indexar(chave, id_)
+        self.apelidos[nome] = id_
+        self.alterado = True
+        return id_
+
+    def mapear(self, serie):
+        """Série de nomes -> ids (Int32), normalizando cada nome distinto uma vez só."""
+        categorias = serie.astype('category')
+        ids = np.array([self.id_de(nome) for nome in categorias.cat.categories] + [0], dtype='int32')
+        codigos = categorias.cat.codes.to_numpy()
+        resultado = pd.array(ids[codigos], dtype='Int32')
+        resultado[codigos < 0] = pd.NA
+        return pd.Series(resultado, index=serie.index, name='ItemId')
+
+    def procurar(self, nome):
+        """Id de um nome digitado (consulta), sem criar item novo; None se não houver."""
+        nome = str(nome)
+        if nome in self.apelidos:
+            return self.apelidos[nome]
+        return self._procurar(normalizar(nome))
+
+    def tabela(self):
+        """Apelidos como DataFrame: apelido, id, nome (canônico)."""
+        df = pd.DataFrame({'apelido': list(self.apelidos), 'id': list(self.apelidos.values())})
+        df['nome'] = df['id'].map(self.nomes)
+        return df
+
+
+@contextlib.contextmanager
+def usar_catalogo(planilha, espera=10):
+    """Catálogo da pasta da planilha, travado contra outro processo e salvo na saída."""
+    caminho = caminho_catalogo(planilha)
+    trava = caminho + '.lock'
+    limite = time.monotonic() + espera
+    while True:
+        try:
+            os.close(os.open(trava, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            with contextlib.suppress(OSError):
+                if time.time() - os.stat(trava).st_mtime > 60:
+                    os.remove(trava)  # trava esquecida por um processo que morreu
+                    continue
+            if time.monotonic() > limite:
+                raise TimeoutError(f"catálogo em uso por outro processo: {trava}")
+            time.sleep(0.05)
+    try:
+        catalogo = Catalogo.abrir(caminho)
+        yield catalogo
+        catalogo.salvar()
+    finally:
+        os.remove(trava)
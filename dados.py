@@ -0,0 +1,291 @@
+"""Carga compartilhada do itens.xlsx.
+
+Todas as ferramentas (dashboard e relatórios) passam por aqui. A primeira
+leitura faz o parse do XLSX, limpa as colunas e cria as colunas de
+calendário (Ano/Mes/Semana/InicioSemana, ver calendario.py); o
+resultado fica salvo em Parquet na pasta de cache. As próximas execuções
+leem direto do Parquet enquanto a planilha não mudar (mtime/tamanho e,
+se preciso, hash do conteúdo).
+
+Cada aba com data vem ordenada por ela e com um DatetimeIndex sobre a
+mesma coluna, para que consultas por intervalo (fatia_datas) sejam uma
+busca binária em vez de uma máscara sobre a tabela inteira.
+
+As abas com a coluna Itens ganham ItemId, o id do item no catálogo
+(catalogo.py), para agrupar e cruzar por inteiro em vez de por nome. As
+compras ganham também UNIDADES, LITROS, CUSTO UNIDADE e CUSTO LITRO,
+tirados da embalagem escrita no nome do item (embalagens.py).
+
+O arquivo é aberto uma única vez para as quatro abas (ler_excel): o
+sharedStrings.xml, os estilos e os metadados do workbook são lidos uma
+vez só. A aba de compras, a maior e a que mais cresce, é lida em
+streaming (ler_aba_em_blocos) em vez de pd.read_excel.
+"""
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from caminhos import ARQUIVO_PADRAO
+from calendario import adicionar_colunas
+from catalogo import caminho_catalogo, usar_catalogo
+from embalagens import adicionar_custos, caminho_ajustes, ler_ajustes
+from esquema import COLUNAS_DINHEIRO, aplicar_esquema
+
+PASTA_CACHE = '.cache_dados'
+VERSAO_CACHE = 8
+
+# nome interno -> (aba no Excel, coluna de data)
+ABAS = {
+    'compras': ('compras da semana', 'Data'),
+    'custos': ('CUSTOS ', 'DATA'),
+    'receb': ('Recebimentos', 'Data'),
+    'vendas': ('VENDAS ', 'Data'),
+}
+
+# abas lidas em blocos de linhas (a de compras cresce toda semana)
+ABAS_EM_BLOCOS = {'compras'}
+TAMANHO_BLOCO = 5000
+
+
+def hash_arquivo(caminho):
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def preparar_aba(nome, df):
+    """Limpa colunas e cria as colunas derivadas de data de uma aba."""
+    df.columns = [str(c).strip() for c in df.columns]
+    col_data = ABAS[nome][1]
+    if col_data not in df.columns:
+        return df
+    df[col_data] = pd.to_datetime(df[col_data])
+    adicionar_colunas(df, col_data)
+    aplicar_esquema(nome, df)
+    # NaT primeiro: é como o searchsorted enxerga (menor valor possível)
+    df = df.sort_values(col_data, kind='stable', na_position='first', ignore_index=True)
+    return indexar_por_data(nome, df)
+
+
+def indexar_por_data(nome, df):
+    col_data = ABAS[nome][1]
+    if col_data in df.columns:
+        # sem nome, para não colidir com a coluna de mesmo nome em groupby/sort_values
+        df.index = pd.DatetimeIndex(df[col_data]).rename(None)
+    return df
+
+
+def fatia_datas(df, inicio, fim):
+    """Linhas dos dias inicio a fim (inclusive), por busca binária no índice de datas.
+
+    Devolve um fatiamento posicional do DataFrame, sem varrer a tabela.
+    """
+    i = df.index.searchsorted(pd.Timestamp(inicio), side='left')
+    j = df.index.searchsorted(pd.Timestamp(fim).normalize() + pd.Timedelta(days=1), side='left')
+    return df.iloc[i:j]
+
+
+def _linhas_xlsx(origem, aba):
+    # openpyxl em modo read_only percorre o XML da aba sem montar a planilha inteira
+    if not isinstance(origem, (str, os.PathLike)):
+        # workbook já aberto (ler_excel): quem abriu fecha
+        yield from origem[aba].iter_rows(values_only=True)
+        return
+
+    from openpyxl import load_workbook
+
+    wb = load_workbook(origem, read_only=True, data_only=True, keep_links=False)
+    try:
+        yield from wb[aba].iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def _tipar_bloco(nome, linhas, colunas):
+    df = pd.DataFrame.from_records(linhas, columns=colunas)
+    col_data = ABAS[nome][1]
+    if col_data in df.columns:
+        df[col_data] = pd.to_datetime(df[col_data])
+    for col in ['QUANTIDADE'] + COLUNAS_DINHEIRO.get(nome, []):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+
+def ler_aba_em_blocos(nome, origem, tamanho_bloco=TAMANHO_BLOCO):
+    """Lê uma aba linha a linha, tipando as colunas a cada bloco de linhas.
+
+    origem é o caminho do arquivo ou um workbook do openpyxl já aberto em
+    read_only. Só um bloco de tuplas do openpyxl fica em memória por vez; o resto já
+    está em colunas tipadas. Linhas vazias no fim da aba são descartadas,
+    como no pd.read_excel.
+    """
+    linhas = _linhas_xlsx(origem, ABAS[nome][0])
+    cabecalho = next(linhas, None)
+    if cabecalho is None:
+        return pd.DataFrame()
+    colunas = [f'Unnamed: {i}' if c is None else str(c).strip() for i, c in enumerate(cabecalho)]
+    n = len(colunas)
+
+    blocos, bloco, vazias = [], [], []
+    for linha in linhas:
+        linha = linha[:n]
+        if all(v is None for v in linha):
+            vazias.append(linha)
+            continue
+        bloco.extend(vazias)
+        vazias = []
+        bloco.append(linha)
+        if len(bloco) >= tamanho_bloco:
+            blocos.append(_tipar_bloco(nome, bloco, colunas))
+            bloco = []
+    if bloco:
+        blocos.append(_tipar_bloco(nome, bloco, colunas))
+    if not blocos:
+        return pd.DataFrame(columns=colunas)
+    return pd.concat(blocos, ignore_index=True)
+
+
+def ler_excel(caminho):
+    """Todas as abas com uma única abertura do arquivo.
+
+    Um pd.read_excel por aba reabriria o zip e refaria o parse de
+    sharedStrings, estilos e workbook.xml a cada vez; aqui o mesmo
+    workbook do openpyxl serve às quatro abas.
+    """
+    dados = {}
+    with pd.ExcelFile(caminho, engine='openpyxl') as excel:
+        for nome, (aba, _) in ABAS.items():
+            if nome in ABAS_EM_BLOCOS:
+                bruto = ler_aba_em_blocos(nome, excel.book)
+            else:
+                bruto = excel.parse(aba)
+            dados[nome] = preparar_aba(nome, bruto)
+    with usar_catalogo(caminho) as catalogo:
+        for df in dados.values():
+            if 'Itens' in df.columns:
+                df['ItemId'] = catalogo.mapear(df['Itens'])
+        # custo por unidade e por litro, com a embalagem lida uma vez por item do catálogo
+        adicionar_custos(dados['compras'], catalogo, ler_ajustes(caminho_ajustes(caminho)))
+    return dados
+
+
+def _pasta_cache(caminho):
+    return os.path.join(os.path.dirname(os.path.abspath(caminho)), PASTA_CACHE)
+
+
+def _ler_chave(pasta):
+    try:
+        with open(os.path.join(pasta, 'chave.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _gravar_chave(pasta, chave):
+    tmp = os.path.join(pasta, 'chave.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(chave, f)
+    os.replace(tmp, os.path.join(pasta, 'chave.json'))
+
+
+def _ler_cache(pasta):
+    # os Parquet já foram gravados ordenados; só o índice precisa ser refeito
+    return {nome: indexar_por_data(nome, pd.read_parquet(os.path.join(pasta, f'{nome}.parquet'))) for nome in ABAS}
+
+
+def _gravar_cache(pasta, dados, chave):
+    os.makedirs(pasta, exist_ok=True)
+    for nome, df in dados.items():
+        tmp = os.path.join(pasta, f'{nome}.parquet.tmp')
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, os.path.join(pasta, f'{nome}.parquet'))
+    _gravar_chave(pasta, chave)
+
+
+def _mtime_catalogo(caminho):
+    # ids editados à mão no catálogo e ajustes de embalagem invalidam o cache
+    mtimes = []
+    for arquivo in (caminho_catalogo(caminho), caminho_ajustes(caminho)):
+        try:
+            mtimes.append(os.stat(arquivo).st_mtime_ns)
+        except FileNotFoundError:
+            mtimes.append(None)
+    return mtimes
+
+
+def carregar_planilhas(caminho=ARQUIVO_PADRAO, usar_cache=True):
+    """Retorna {'compras', 'custos', 'receb', 'vendas'} já com as colunas de calendário."""
+    if not usar_cache:
+        return ler_excel(caminho)
+
+    pasta = _pasta_cache(caminho)
+    st = os.stat(caminho)
+    chave = _ler_chave(pasta)
+
+    if chave and chave.get('versao') == VERSAO_CACHE and chave.get('catalogo') == _mtime_catalogo(caminho):
+        mesmo_arquivo = chave['mtime'] == st.st_mtime_ns and chave['tamanho'] == st.st_size
+        if not mesmo_arquivo and chave['tamanho'] == st.st_size:
+            # mtime mudou (cópia, sync do OneDrive...) mas o conteúdo pode ser o mesmo
+            if chave['sha256'] == hash_arquivo(caminho):
+                chave['mtime'] = st.st_mtime_ns
+                _gravar_chave(pasta, chave)
+                mesmo_arquivo = True
+        if mesmo_arquivo:
+            try:
+                return _ler_cache(pasta)
+            except (OSError, ImportError, ValueError):
+                pass
+
+    dados = ler_excel(caminho)
+    nova_chave = {
+        'versao': VERSAO_CACHE,
+        'mtime': st.st_mtime_ns,
+        'tamanho': st.st_size,
+        'sha256': hash_arquivo(caminho),
+        'catalogo': _mtime_catalogo(caminho),
+    }
+    try:
+        _gravar_cache(pasta, dados, nova_chave)
+    except (OSError, ImportError) as e:
+        print(f"Aviso: cache de dados não gravado ({e})")
+    return dados
+
+
+# colunas que os relatórios usam em cada aba
+COLUNAS_OBRIGATORIAS = {
+    'compras': ['Itens', 'tipo', 'QUANTIDADE', 'Data', 'VALOR UND', 'TOTAL'],
+    'custos': ['DESCRIÇÃO', 'TIPO', 'DATA', 'VALOR'],
+    'receb': ['Data', 'Fonte', 'VALOR'],
+}
+
+
+def validar_planilhas(dados):
+    """Lista de problemas encontrados nas abas (vazia se está tudo certo)."""
+    problemas = []
+    for nome, colunas in COLUNAS_OBRIGATORIAS.items():
+        aba = ABAS[nome][0]
+        df = dados[nome]
+        faltando = [c for c in colunas if c not in df.columns]
+        if faltando:
+            problemas.append(f"'{aba}': colunas ausentes {faltando}")
+            continue
+        for col in colunas:
+            vazios = int(df[col].isna().sum())
+            if vazios:
+                problemas.append(f"'{aba}': {vazios} linha(s) sem {col}")
+
+    compras = dados['compras']
+    if all(c in compras.columns for c in COLUNAS_OBRIGATORIAS['compras']):
+        # valores em centavos; VALOR UND arredondado ao centavo pode errar meio centavo por unidade
+        desconto = compras['DESCONTO'].fillna(0) if 'DESCONTO' in compras.columns else 0
+        esperado = compras['QUANTIDADE'] * compras['VALOR UND'] - desconto
+        tolerancia = 1 + compras['QUANTIDADE'].abs() / 2
+        divergentes = int(((esperado - compras['TOTAL']).abs() > tolerancia).sum())
+        if divergentes:
+            problemas.append(f"'compras da semana': {divergentes} linha(s) com TOTAL diferente de QUANTIDADE x VALOR UND - DESCONTO")
+    return problemas
@@ -0,0 +1,177 @@
+"""Embalagem de cada item (unidades por pacote e volume) e custo por unidade e por litro.
+
+O nome do item traz a embalagem: 'ESTRELA G LN 355ML (6UND)', 'DV UVA LT
+6X290ML RV', 'GUARANA 1L ANTARCTICA 6PACK', 'COPO DESC PP 400ML 50UND',
+'POLPA DE FRUTAS CAJU 4X12X100G'. Daqui saem:
+
+- unidades por pacote: '(6UND)', '50UND', 'C30UN', '6PACK' ou o
+  multiplicador de 'NxTAMANHO' (com unidade: '6X290ML', '4X12X100G');
+  sem nada disso, 1. '10X30X50' (medidas) e '6X290' (sem unidade) não contam;
+- volume de cada unidade, em litros: '355ML', '1L', '1,75L', '20LT'. Só
+  vale para bebidas e comida (TIPOS_EM_LITROS) e até LITROS_MAXIMO: o
+  '200L' do saco de lixo e o '32LT' da caixa térmica são capacidade,
+  não conteúdo.
+
+A leitura é feita uma vez por nome canônico do catálogo (catalogo.py),
+com str.extract sobre os nomes ainda não vistos, e guardada em memória.
+
+A QUANTIDADE da compra conta pacotes: 8 de 'ESTRELA (6UND)' são 48
+latas. Itens lançados por unidade (6 de 'DV UVA LT 6X290ML' a R$ 3,38)
+ficam no embalagens.json, ao lado da planilha, com "quantidade":
+"unidades" (e, se só parte das compras foi assim, "desde"/"ate" com as
+datas AAAA-MM-DD); o mesmo arquivo corrige a leitura do nome ("unidades",
+"litros") de um item. As chaves são nomes de item, achados pelo catálogo
+(qualquer apelido serve). O custo sai do TOTAL da linha (já com
+desconto), em centavos.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from catalogo import normalizar
+
+ARQUIVO_AJUSTES = 'embalagens.json'
+
+TIPOS_EM_LITROS = {'AGUA', 'BEBIDAS', 'CAFÉ', 'CERVEJA', 'CHA', 'COMIDA', 'DESTILADOS', 'FEIJOADA',
+                   'REFRIGERANTE', 'SUCO'}
+LITROS_MAXIMO = 20
+
+_CONTAGEM = r'(?<![\d,])(\d+)\s*(?:UNID|UND|UN)\b'
+_PACK = r'(?<![\d,])(\d+)\s*PACK\b'
+_MULTIPLO = r'(?<![\d,X])(\d+)X(?:(\d+)X)?\d+(?:,\d+)?\s*(?:ML|LT|L|KG|GR|G)\b'
+_VOLUME = r'(?<![\d,])(\d+(?:,\d+)?)\s*(ML|LT|L)\b'
+
+# nome canônico -> (unidades por pacote, litros por unidade)
+_EMBALAGENS = {}
+
+
+def _numero(serie):
+    return pd.to_numeric(serie.str.replace(',', '.', regex=False), errors='coerce')
+
+
+def ler_embalagens(nomes):
+    """DataFrame (unidades, litros) de cada nome, no índice de nomes; litros NaN sem volume."""
+    nomes = pd.Series(nomes, dtype=object)
+    novos = pd.Series(pd.unique(nomes[~nomes.isin(_EMBALAGENS)]), dtype=object)
+    if not novos.empty:
+        chaves = novos.map(normalizar)
+        multiplo = chaves.str.extract(_MULTIPLO)
+        unidades = (chaves.str.extract(_CONTAGEM)[0]
+                    .fillna(chaves.str.extract(_PACK)[0])
+                    .pipe(_numero)
+                    .fillna(_numero(multiplo[0]) * _numero(multiplo[1]).fillna(1))
+                    .fillna(1))
+        volume = chaves.str.extract(_VOLUME)
+        litros = _numero(volume[0]) / np.where(volume[1] == 'ML', 1000, 1)
+        _EMBALAGENS.update(zip(novos, zip(unidades, litros)))
+    return pd.DataFrame([_EMBALAGENS[nome] for nome in nomes], index=nomes.index, columns=['unidades', 'litros'])
+
+
+def caminho_ajustes(planilha):
+    return os.path.join(os.path.dirname(os.path.abspath(planilha)), ARQUIVO_AJUSTES)
+
+
+def ler_ajustes(caminho):
+    """{nome do item: ajuste} do embalagens.json; vazio se o arquivo não existir."""
+    try:
+        with open(caminho, encoding='utf-8') as f:
+            conteudo = json.load(f)
+    except FileNotFoundError:
+        return {}
+    for nome, ajuste in conteudo.items():
+        if ajuste.get('quantidade', 'pacotes') not in ('pacotes', 'unidades'):
+            raise ValueError(f"{caminho}: 'quantidade' de {nome!r} deve ser 'pacotes' ou 'unidades'")
+    return conteudo
+
+
+def _ajustes_por_id(catalogo, ajustes, ids):
+    # o nome do ajuste pode ser qualquer apelido do item: o catálogo acha o id
+    for nome, ajuste in (ajustes or {}).items():
+        id_ = catalogo.procurar(nome)
+        if id_ in ids:  # itens que ainda não apareceram na planilha ficam de fora
+            yield id_, ajuste
+
+
+def embalagens_dos_itens(catalogo, ajustes=None):
+    """Por id do catálogo: unidades por pacote e litros por unidade, já com os ajustes."""
+    nomes = catalogo.nomes
+    embalagens = ler_embalagens(pd.Series(list(nomes.values()), index=list(nomes), dtype=object))
+    for id_, ajuste in _ajustes_por_id(catalogo, ajustes, embalagens.index):
+        for coluna in ('unidades', 'litros'):
+            if coluna in ajuste:
+                embalagens.loc[id_, coluna] = ajuste[coluna]
+    return embalagens
+
+
+def _em_unidades(compras, catalogo, ajustes):
+    """Linhas cuja QUANTIDADE conta unidades: itens com "quantidade": "unidades", entre "desde" e "ate"."""
+    linhas = np.zeros(len(compras), dtype=bool)
+    ids = compras['ItemId'].to_numpy(dtype='float64', na_value=np.nan)
+    datas = compras['Data']
+    for id_, ajuste in _ajustes_por_id(catalogo, ajustes, catalogo.nomes):
+        if ajuste.get('quantidade') != 'unidades':
+            continue
+        do_item = ids == id_
+        if 'desde' in ajuste:
+            do_item &= (datas >= pd.Timestamp(ajuste['desde'])).to_numpy()
+        if 'ate' in ajuste:
+            do_item &= (datas <= pd.Timestamp(ajuste['ate'])).to_numpy()
+        linhas |= do_item
+    return linhas
+
+
+def adicionar_custos(compras, catalogo, ajustes=None):
+    """Acrescenta UNIDADES, LITROS, CUSTO UNIDADE e CUSTO LITRO às compras (in place).
+
+    catalogo: o Catalogo que deu o ItemId, para ler cada embalagem uma vez
+    por item; ajustes: ler_ajustes(caminho_ajustes(planilha)).
+    """
+    embalagens = embalagens_dos_itens(catalogo, ajustes).reindex(compras['ItemId'])
+    quantidade = compras['QUANTIDADE'].astype('float64').to_numpy()
+    unidades = np.where(_em_unidades(compras, catalogo, ajustes), quantidade,
+                        quantidade * embalagens['unidades'].to_numpy())
+
+    litros_unidade = embalagens['litros'].to_numpy()
+    em_litros = compras['tipo'].astype(str).str.strip().isin(TIPOS_EM_LITROS).to_numpy()
+    litros_unidade = np.where(em_litros & (litros_unidade <= LITROS_MAXIMO), litros_unidade, np.nan)
+    litros = unidades * litros_unidade
+
+    total = compras['TOTAL'].astype('float64').to_numpy()
+    compras['UNIDADES'] = unidades
+    compras['LITROS'] = litros
+    with np.errstate(divide='ignore', invalid='ignore'):
+        custo_unidade = np.where(unidades > 0, total / unidades, np.nan)
+        custo_litro = np.where(litros > 0, total / litros, np.nan)
+    compras['CUSTO UNIDADE'] = pd.Series(custo_unidade, index=compras.index).round().astype('Int64')
+    compras['CUSTO LITRO'] = pd.Series(custo_litro, index=compras.index).round().astype('Int64')
+    return compras
+
+
+def ranking_custos(compras):
+    """Itens do mais barato ao mais caro por litro (e por unidade), dentro de cada tipo.
+
+    Custo = soma do TOTAL / soma de litros (ou unidades) das compras, em centavos.
+    Com o banco, as somas saem de um GROUP BY (banco.ranking_custos_do_banco).
+    """
+    df = compras.dropna(subset=['ItemId'])
+    ranking = df.groupby('ItemId', observed=True).agg(
+        item=('Itens', 'last'), tipo=('tipo', 'last'), compras=('TOTAL', 'size'),
+        total=('TOTAL', 'sum'), unidades=('UNIDADES', 'sum'), litros=('LITROS', 'sum'))
+    return ordenar_ranking(ranking.reset_index())
+
+
+def ordenar_ranking(ranking):
+    """Custo por unidade e por litro a partir das somas por item, na ordem do ranking.
+
+    Colunas de entrada: ItemId, item, tipo, compras, total, unidades, litros.
+    """
+    ranking['item'] = ranking['item'].astype(str).str.strip()
+    ranking['tipo'] = ranking['tipo'].astype(str)
+    total = ranking['total'].astype('float64')
+    ranking['custo_unidade'] = (total / ranking['unidades'].where(ranking['unidades'] > 0)).round().astype('Int64')
+    ranking['custo_litro'] = (total / ranking['litros'].where(ranking['litros'] > 0)).round().astype('Int64')
+    # estável: empates ficam na ordem do ItemId, com e sem banco
+    return ranking.sort_values(['tipo', 'custo_litro', 'custo_unidade'], na_position='last', kind='stable',
+                               ignore_index=True)
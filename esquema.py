@@ -0,0 +1,60 @@
+"""Tipos das colunas depois da carga.
+
+- dinheiro (VALOR, TOTAL, VALOR UND, DESCONTO e os custos por unidade e
+  por litro de embalagens.py) em centavos, Int64 (aceita vazio). Somas e
+  saldos ficam exatos; formatar_centavos/em_reais fazem a conversão só
+  na hora de mostrar;
+- itens, tipos, fontes e descrições como category; o id do item
+  (catalogo.py) em Int32;
+- Ano/Mes/Semana em inteiros pequenos.
+"""
+import pandas as pd
+
+COLUNAS_DINHEIRO = {
+    'compras': ['VALOR UND', 'DESCONTO', 'TOTAL', 'CUSTO UNIDADE', 'CUSTO LITRO'],
+    'custos': ['VALOR'],
+    'receb': ['VALOR'],
+    'vendas': ['VALOR', 'TOTAL'],
+}
+
+COLUNAS_CATEGORIA = {
+    'compras': ['Itens', 'tipo'],
+    'custos': ['DESCRIÇÃO', 'TIPO', 'FREQUENCIA'],
+    'receb': ['Fonte'],
+}
+
+COLUNAS_CALENDARIO = {'Ano': 'int16', 'Mes': 'int8', 'Semana': 'int8'}
+
+COLUNAS_ID = {'ItemId': 'Int32'}
+
+
+def para_centavos(serie):
+    valores = pd.to_numeric(serie, errors='coerce')
+    # round(6) antes tira o ruído de ponto flutuante (ex.: 0.285 * 100 = 28.499999...)
+    return (valores * 100).round(6).round().astype('Int64')
+
+
+def em_reais(df, coluna):
+    """Cópia do DataFrame com a coluna de centavos convertida para reais (para os gráficos)."""
+    return df.assign(**{coluna: df[coluna].astype('float64') / 100})
+
+
+def aplicar_esquema(nome, df, em_centavos=False):
+    """Aplica os tipos acima (in place).
+
+    em_centavos=True quando o dinheiro já vem em centavos (banco.py).
+    """
+    for col in COLUNAS_DINHEIRO.get(nome, []):
+        if col in df.columns:
+            df[col] = df[col].astype('Int64') if em_centavos else para_centavos(df[col])
+    for col in COLUNAS_CATEGORIA.get(nome, []):
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col, tipo in COLUNAS_ID.items():
+        if col in df.columns:
+            df[col] = df[col].astype(tipo)
+    for col, tipo in COLUNAS_CALENDARIO.items():
+        if col in df.columns:
+            # datas vazias deixam NaN: usa o inteiro que aceita nulo (Int16/Int8)
+            df[col] = df[col].astype(tipo if df[col].notna().all() else tipo.capitalize())
+    return df
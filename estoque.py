@@ -0,0 +1,242 @@
+"""Razão de estoque por item: contagens periódicas + compras.
+
+As contagens vêm das planilhas da pasta Estoque (uma aba por contagem,
+colunas item e quantidade). A data de cada contagem é a escrita no
+cabeçalho ("Itens (13/06/2025)"), ou a do nome da aba ("06-06-25") ou
+do arquivo; abas sem data (o modelo em branco) ficam de fora.
+
+Os itens são cruzados pelo id do catálogo (catalogo.py), então
+'(PROMO) STELLA LOG NECK 330ML' e 'STELLA LOG NECK 330ML' são o mesmo
+estoque. O razão (tabela razao_estoque do cafe.db) tem uma linha por movimento,
+já com o saldo corrido do item: a contagem fixa o saldo (e guarda em
+`ajuste` a diferença para o esperado, ou seja, o consumo/perda desde a
+contagem anterior) e cada compra soma as suas UNIDADES (a QUANTIDADE
+vezes as unidades do pacote, ver embalagens.py). Antes da primeira
+contagem de um item o saldo é desconhecido (NULL). No mesmo dia, as
+compras entram antes da contagem.
+
+A cada importação só os itens com compras/contagens novas ou removidas
+são refeitos, e só a partir da data mais antiga alterada. "Estoque de X
+no dia D" é uma busca no índice (item_id, data): a última linha até D.
+"""
+import glob
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from banco import aspas, colunas_da_tabela
+from catalogo import Catalogo
+
+PASTA_ESTOQUE = 'Estoque'
+
+# tabela de origem -> ordem no dia (compras antes da contagem)
+ORIGENS = {'compras': 0, 'contagens': 1}
+
+# coluna com a quantidade em unidades: nas compras a QUANTIDADE pode contar pacotes (embalagens.py)
+QUANTIDADES = {'compras': 'UNIDADES', 'contagens': 'QUANTIDADE'}
+
+
+def _validas(tabela):
+    """Linhas que entram no razão: com item, data e quantidade."""
+    return f'ItemId IS NOT NULL AND Data IS NOT NULL AND {aspas(QUANTIDADES[tabela])} IS NOT NULL'
+
+
+_DATA = re.compile(r'(\d{1,2})[-/.](\d{1,2})[-/.](\d{2,4})')
+
+
+def _data_do_texto(texto):
+    """Primeira data DD/MM/AA(AA) (ou com - e .) no texto; None se não houver."""
+    m = _DATA.search(str(texto))
+    if not m:
+        return None
+    dia, mes, ano = (int(g) for g in m.groups())
+    try:
+        return pd.Timestamp(ano + 2000 if ano < 100 else ano, mes, dia)
+    except ValueError:
+        return None
+
+
+def ler_contagens(pasta=PASTA_ESTOQUE):
+    """Contagens datadas das planilhas da pasta: Data, Itens, QUANTIDADE, Origem."""
+    from openpyxl import load_workbook
+
+    partes = []
+    for caminho in sorted(glob.glob(os.path.join(pasta, '*.xlsx'))):
+        arquivo = os.path.basename(caminho)
+        if arquivo.startswith('~$'):
+            continue  # arquivo de trava do Excel aberto
+        wb = load_workbook(caminho, read_only=True, data_only=True)
+        try:
+            for ws in wb.worksheets:
+                linhas = ws.iter_rows(values_only=True)
+                cabecalho = next(linhas, None)
+                # abas de contagem: "Itens (__/__/__)" | "quantidade"; as outras (listas de itens) ficam de fora
+                if not cabecalho or len(cabecalho) < 2 or not str(cabecalho[0] or '').startswith('Itens'):
+                    continue
+                if str(cabecalho[1] or '').strip().lower() != 'quantidade':
+                    continue
+                data = _data_do_texto(cabecalho[0]) or _data_do_texto(ws.title) or _data_do_texto(arquivo)
+                if data is None:
+                    print(f"Aviso: contagem sem data em {arquivo}:{ws.title} (preencha a data no cabeçalho); ignorada")
+                    continue
+                df = pd.DataFrame([linha[:2] for linha in linhas], columns=['Itens', 'QUANTIDADE'])
+                df['QUANTIDADE'] = pd.to_numeric(df['QUANTIDADE'], errors='coerce')
+                df = df.dropna()
+                df.insert(0, 'Data', data)
+                df['Origem'] = f'{arquivo}:{ws.title}'
+                partes.append(df)
+        finally:
+            wb.close()
+    if not partes:
+        return pd.DataFrame({'Data': pd.Series(dtype='datetime64[us]'), 'Itens': pd.Series(dtype=str),
+                             'QUANTIDADE': pd.Series(dtype=float), 'Origem': pd.Series(dtype=str)})
+    df = pd.concat(partes, ignore_index=True)
+    df['Itens'] = df['Itens'].astype(str).str.strip()
+    return df
+
+
+def _criar_razao(con):
+    con.execute('''CREATE TABLE IF NOT EXISTS razao_estoque (
+        item_id INTEGER NOT NULL, data TEXT NOT NULL, ordem INTEGER NOT NULL,
+        tabela TEXT NOT NULL, chave TEXT NOT NULL,
+        quantidade REAL NOT NULL, saldo REAL, ajuste REAL)''')
+    con.execute('CREATE INDEX IF NOT EXISTS razao_estoque_item_data ON razao_estoque (item_id, data, ordem)')
+    con.execute('CREATE INDEX IF NOT EXISTS razao_estoque_origem ON razao_estoque (tabela, chave)')
+
+
+def _itens_alterados(con):
+    """{item: data mais antiga} das linhas de origem que entraram ou saíram desde o último acerto."""
+    alterados = {}
+    for tabela in ORIGENS:
+        consultas = []
+        if colunas_da_tabela(con, tabela):
+            consultas.append((f'''
+                SELECT ItemId, MIN(Data) FROM {aspas(tabela)}
+                WHERE {_validas(tabela)}
+                  AND chave NOT IN (SELECT chave FROM razao_estoque WHERE tabela = ?)
+                GROUP BY ItemId''', (tabela,)))
+            consultas.append((f'''
+                SELECT item_id, MIN(data) FROM razao_estoque
+                WHERE tabela = ? AND chave NOT IN (SELECT chave FROM {aspas(tabela)})
+                GROUP BY item_id''', (tabela,)))
+        else:
+            # a tabela de origem sumiu (ex.: sem pasta de contagens): tudo que veio dela sai
+            consultas.append(('SELECT item_id, MIN(data) FROM razao_estoque WHERE tabela = ? GROUP BY item_id', (tabela,)))
+        for sql, params in consultas:
+            for item, data in con.execute(sql, params):
+                if item not in alterados or data < alterados[item]:
+                    alterados[item] = data
+    return alterados
+
+
+def _movimentos_desde(con, inicio):
+    """Linhas de compras e contagens a partir de inicio, na ordem do razão."""
+    partes = []
+    for tabela, ordem in ORIGENS.items():
+        if colunas_da_tabela(con, tabela):
+            partes.append(f'''
+                SELECT ItemId AS item_id, Data AS data, {ordem} AS ordem, '{tabela}' AS tabela,
+                       chave, {aspas(QUANTIDADES[tabela])} AS quantidade, rowid AS posicao
+                FROM {aspas(tabela)} WHERE {_validas(tabela)} AND Data >= ?''')
+    if not partes:
+        return pd.DataFrame(columns=['item_id', 'data', 'ordem', 'tabela', 'chave', 'quantidade', 'posicao'])
+    sql = ' UNION ALL '.join(partes) + ' ORDER BY item_id, data, ordem, posicao'
+    return pd.read_sql_query(sql, con, params=[inicio] * len(partes))
+
+
+def atualizar_razao(con):
+    """Refaz o razão só dos itens alterados, a partir da data alterada; devolve (inseridas, removidas).
+
+    Roda dentro da transação da importação (banco.importar_planilhas),
+    depois de compras e contagens sincronizadas.
+    """
+    _criar_razao(con)
+    alterados = _itens_alterados(con)
+    if not alterados:
+        return 0, 0
+
+    saldos, removidas = {}, 0
+    for item, data in alterados.items():
+        linha = con.execute('''SELECT saldo FROM razao_estoque WHERE item_id = ? AND data < ?
+                               ORDER BY data DESC, ordem DESC, rowid DESC LIMIT 1''', (item, data)).fetchone()
+        saldos[item] = linha[0] if linha else None
+        removidas += con.execute('DELETE FROM razao_estoque WHERE item_id = ? AND data >= ?', (item, data)).rowcount
+
+    movimentos = _movimentos_desde(con, min(alterados.values()))
+    movimentos = movimentos[movimentos['data'] >= movimentos['item_id'].map(alterados)]
+
+    novas = []
+    for item, data, ordem, tabela, chave, quantidade in movimentos[
+            ['item_id', 'data', 'ordem', 'tabela', 'chave', 'quantidade']].itertuples(index=False):
+        saldo, ajuste = saldos[item], None
+        if tabela == 'contagens':
+            if saldo is not None:
+                ajuste = quantidade - saldo
+            saldo = quantidade
+        elif saldo is not None:
+            saldo += quantidade
+        saldos[item] = saldo
+        novas.append((item, data, ordem, tabela, chave, quantidade, saldo, ajuste))
+    con.executemany('''INSERT INTO razao_estoque (item_id, data, ordem, tabela, chave, quantidade, saldo, ajuste)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)''', novas)
+    return len(novas), removidas
+
+
+def _dia(data):
+    return pd.Timestamp(data).strftime('%Y-%m-%d')
+
+
+def _catalogo(con):
+    """Catálogo montado da cópia gravada no banco (banco._gravar_catalogo)."""
+    apelidos = dict(con.execute('SELECT apelido, id FROM catalogo_itens'))
+    nomes = dict(con.execute('SELECT id, MIN(nome) FROM catalogo_itens GROUP BY id'))
+    return Catalogo(nomes=nomes, apelidos=apelidos)
+
+
+def id_do_item(con, item):
+    """Id do item pelo nome (como na planilha ou normalizado) ou o próprio id; None se não existir."""
+    if isinstance(item, (int, np.integer)):
+        return int(item)
+    return _catalogo(con).procurar(item)
+
+
+def _ultima_linha(con, item_id, data):
+    return con.execute('''SELECT saldo, data FROM razao_estoque WHERE item_id = ? AND data <= ?
+                          ORDER BY data DESC, ordem DESC, rowid DESC LIMIT 1''', (item_id, _dia(data))).fetchone()
+
+
+def saldo_em(con, item, data):
+    """Estoque do item (nome ou id) no fim do dia; None se o item não tem contagem até lá."""
+    item_id = id_do_item(con, item)
+    linha = _ultima_linha(con, item_id, data) if item_id is not None else None
+    return linha[0] if linha else None
+
+
+def posicao_em(con, data):
+    """Estoque de todos os itens com saldo conhecido no fim do dia: item_id, item, saldo, ultimo_movimento."""
+    nomes = _catalogo(con).nomes
+    linhas = []
+    for (item_id,) in con.execute('SELECT DISTINCT item_id FROM razao_estoque ORDER BY item_id').fetchall():
+        linha = _ultima_linha(con, item_id, data)
+        if linha and linha[0] is not None:
+            linhas.append((item_id, nomes.get(item_id, str(item_id)), linha[0], linha[1]))
+    df = pd.DataFrame(linhas, columns=['item_id', 'item', 'saldo', 'ultimo_movimento'])
+    df['ultimo_movimento'] = pd.to_datetime(df['ultimo_movimento'])
+    return df.sort_values('item', ignore_index=True)
+
+
+def movimentos_do_item(con, item, inicio=None, fim=None):
+    """Linhas do razão de um item (compras, contagens, saldo e ajuste), em ordem."""
+    sql = 'SELECT data, tabela, quantidade, saldo, ajuste FROM razao_estoque WHERE item_id = ?'
+    params = [id_do_item(con, item)]
+    if inicio is not None:
+        sql += ' AND data >= ?'
+        params.append(_dia(inicio))
+    if fim is not None:
+        sql += ' AND data <= ?'
+        params.append(_dia(fim))
+    df = pd.read_sql_query(sql + ' ORDER BY data, ordem, rowid', con, params=params)
+    df['data'] = pd.to_datetime(df['data'])
+    return df
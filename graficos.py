@@ -0,0 +1,113 @@
+"""Gráficos dos relatórios renderizados em memória.
+
+Cada função devolve um BytesIO com a imagem, que vai direto para
+pdf.image(...). Nada passa pelo disco, então execuções simultâneas não
+sobrescrevem os arquivos de gráfico umas das outras.
+
+Por padrão a imagem é SVG: o fpdf converte para operações vetoriais do
+PDF, então barras, fatias e textos ficam nítidos em qualquer zoom e o
+PDF fica bem menor que com PNG. CAFE_GRAFICOS=png volta ao raster.
+
+Os gráficos usam a API orientada a objetos do matplotlib (Figure + canvas
+Agg), sem pyplot e sem seaborn. Uma figura por tamanho é criada na
+primeira vez e depois só limpa e reaproveitada entre semanas/meses. O
+pool não é thread-safe: cada processo de relatório desenha um gráfico
+por vez.
+"""
+import os
+from io import BytesIO
+
+import pandas as pd
+
+FORMATO = os.environ.get('CAFE_GRAFICOS', 'svg')
+
+# sem <metadata> (o fpdf ignora e avisa) e sem data, para o SVG sair igual a cada execução
+_METADADOS_SVG = {'Date': None, 'Creator': None, 'Format': None, 'Type': None}
+
+_figuras = {}
+
+
+def formatar_valor(valor):
+    return f"R$ {valor:,.2f}".replace(",", "v").replace(".", ",").replace("v", ".")
+
+
+def formatar_centavos(centavos):
+    """Formata um valor guardado em centavos (ver esquema.py)."""
+    return formatar_valor(int(centavos) / 100)
+
+
+def _eixos(tamanho):
+    """Figura do pool para o tamanho pedido, limpa, com um único eixo."""
+    fig = _figuras.get(tamanho)
+    if fig is None:
+        # matplotlib só é importado quando o primeiro gráfico é desenhado
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=tamanho)
+        FigureCanvasAgg(fig)
+        _figuras[tamanho] = fig
+    else:
+        fig.clear()
+    return fig, fig.add_subplot()
+
+
+def _imagem(fig):
+    buffer = BytesIO()
+    if FORMATO == 'svg':
+        from matplotlib import rc_context
+
+        # textos como <text>: viram texto do PDF (fonte padrão) em vez de um contorno por letra,
+        # que o fpdf leva muito mais tempo para converter; hashsalt fixo mantém os ids do SVG.
+        # As fontes padrão do PDF não têm o sinal de menos U+2212: eixos negativos usam '-'
+        with rc_context({'svg.hashsalt': 'cafe-musical', 'svg.fonttype': 'none', 'axes.unicode_minus': False}):
+            fig.savefig(buffer, format='svg', facecolor='white', metadata=_METADADOS_SVG)
+    else:
+        fig.savefig(buffer, format='png', facecolor='white')
+    buffer.seek(0)
+    return buffer
+
+
+def grafico_barras(dados, titulo, nome_coluna, valor_coluna, cores=None):
+    fig, ax = _eixos((8, 5))
+    labels = [str(v) for v in dados[nome_coluna]]
+    posicoes = range(len(labels))
+    cor_barras = [cores[i % len(cores)] for i in posicoes] if cores else 'C0'
+    ax.bar(posicoes, dados[valor_coluna], color=cor_barras, width=0.8)
+    ax.set_xticks(list(posicoes))
+    ax.set_xticklabels(labels, rotation=45, ha='right')
+    ax.set_title(titulo)
+    ax.set_xlabel(nome_coluna)
+    ax.set_ylabel(valor_coluna)
+    ax.grid(True, linestyle='--', alpha=0.6)
+    fig.tight_layout()
+    return _imagem(fig)
+
+
+def grafico_pizza_resumo(valores, labels, cores, titulo):
+    """Pizza simples; devolve None quando não há valor para desenhar."""
+    if not any(pd.notna(valores)) or sum(valores) == 0:
+        print(f"Aviso: gráfico '{titulo}' não gerado pois todos os valores são nulos ou zero.")
+        return None
+
+    fig, ax = _eixos((6, 6))
+    ax.pie(valores, labels=labels, autopct='%1.1f%%', startangle=90, colors=cores)
+    ax.set_title(titulo)
+    fig.tight_layout()
+    return _imagem(fig)
+
+
+def grafico_pizza(dados, titulo, valor_coluna, nome_coluna, cores=None):
+    return grafico_pizza_resumo(list(dados[valor_coluna]), list(dados[nome_coluna]), cores, titulo)
+
+
+def grafico_barras_resumo(valores, labels, cores, titulo):
+    fig, ax = _eixos((8, 5))
+    bars = ax.bar(labels, valores, color=cores)
+    ax.set_title(titulo)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    fig.tight_layout()
+    for bar, val in zip(bars, valores):
+        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height(), formatar_valor(val),
+                ha='center', va='bottom', fontsize=9, fontweight='bold')
+    return _imagem(fig)
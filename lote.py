@@ -0,0 +1,103 @@
+"""Geração de vários relatórios em paralelo.
+
+Cada tarefa é um relatório independente:
+    ('mensal', ano, mes)
+    ('anual', ano)
+    ('periodo', data_inicial, data_final)
+
+As tarefas são distribuídas num pool de processos (a renderização dos
+gráficos do matplotlib é o que mais pesa). Os dados vão para cada
+processo uma única vez, no initializer. Como cada PDF é montado pelo
+mesmo código do caminho serial, o arquivo gerado é o mesmo.
+"""
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from manifesto import Manifesto, arquivo_da_tarefa, chaves_das_tarefas
+from medicao import perfilar
+
+_cubo = None
+_dados = None
+_metricas = None
+
+
+def _iniciar(cubo, dados, metricas=None):
+    global _cubo, _dados, _metricas
+    _cubo, _dados, _metricas = cubo, dados, metricas
+
+
+def _executar(tarefa, output_dir):
+    """Roda uma tarefa; devolve o traceback em caso de erro para o processo principal registrar."""
+    try:
+        # fpdf e matplotlib só entram quando há relatório para gerar
+        from relatorios import gerar_relatorio_anual, gerar_relatorio_mensal, gerar_relatorio_periodo
+
+        tipo = tarefa[0]
+        # com CAFE_PERFIL, perfis/relatorio_<...>.prof (medicao.py)
+        with perfilar(os.path.splitext(arquivo_da_tarefa(tarefa))[0]):
+            if tipo == 'mensal':
+                gerar_relatorio_mensal(_cubo, tarefa[1], tarefa[2], output_dir, _metricas)
+            elif tipo == 'anual':
+                gerar_relatorio_anual(_cubo, tarefa[1], output_dir, _metricas)
+            elif tipo == 'periodo':
+                from precos import altas_da_semana
+
+                gerar_relatorio_periodo(_dados['compras'], _dados['custos'], _dados['receb'], tarefa[1], tarefa[2],
+                                        output_dir, altas=altas_da_semana(_dados, tarefa[1], tarefa[2]),
+                                        metricas=_metricas)
+            else:
+                raise ValueError(f"Tarefa desconhecida: {tarefa!r}")
+    except Exception:
+        return traceback.format_exc()
+    return None
+
+
+def tarefas_padrao(cubo):
+    """Todos os relatórios mensais seguidos dos anuais."""
+    tarefas = [('mensal', ano, mes) for ano in cubo.anos('compras') for mes in cubo.meses(ano, 'compras')]
+    tarefas += [('anual', ano) for ano in cubo.anos('compras')]
+    return tarefas
+
+
+def gerar_em_lote(cubo, dados, tarefas, output_dir='relatorios', processos=None, incremental=False,
+                  metricas=None):
+    """Gera os relatórios das tarefas e devolve [(tarefa, erro)] das que rodaram (erro None se deu certo).
+
+    Com incremental=True, tarefas cujo PDF já existe e cujas linhas de origem
+    não mudaram desde a última geração (ver manifesto.py) são puladas.
+    metricas: arquivo .jsonl onde cada relatório grava seu tempo por etapa
+    (medicao.py); None não grava nada.
+    """
+    tarefas = list(tarefas)
+    manifesto = None
+    if incremental:
+        manifesto = Manifesto(output_dir)
+        chaves = dict(zip(tarefas, chaves_das_tarefas(tarefas, dados)))
+        pendentes = [t for t in tarefas if not manifesto.atualizado(arquivo_da_tarefa(t), chaves[t])]
+        if len(pendentes) < len(tarefas):
+            print(f"{len(tarefas) - len(pendentes)} relatório(s) sem alteração nos dados, mantidos.")
+        tarefas = pendentes
+
+    if processos is None:
+        processos = min(len(tarefas), os.cpu_count() or 1)
+
+    if processos <= 1 or len(tarefas) <= 1:
+        _iniciar(cubo, dados, metricas)
+        erros = [_executar(tarefa, output_dir) for tarefa in tarefas]
+    else:
+        with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar,
+                                 initargs=(cubo, dados, metricas)) as executor:
+            erros = list(executor.map(_executar, tarefas, [output_dir] * len(tarefas)))
+
+    for tarefa, erro in zip(tarefas, erros):
+        if erro:
+            from relatorios import log_erro
+
+            arquivo = "relatorio_anual_erro.log" if tarefa[0] == 'anual' else "relatorio_erro.log"
+            log_erro(f"{tarefa}: {erro}", arquivo)
+        elif manifesto is not None:
+            manifesto.registrar(arquivo_da_tarefa(tarefa), chaves[tarefa])
+    if manifesto is not None:
+        manifesto.salvar()
+    return list(zip(tarefas, erros))
@@ -0,0 +1,125 @@
+"""Manifesto para regeneração incremental dos relatórios.
+
+Guarda, para cada PDF gerado, um hash do conteúdo das linhas que o
+alimentam. No modo incremental um relatório só é refeito se esse hash
+mudou (ou se o PDF sumiu da pasta).
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from dados import fatia_datas
+
+ARQUIVO_MANIFESTO = 'manifesto.json'
+# muda quando o layout dos relatórios muda, para forçar a regeneração de tudo
+VERSAO_RELATORIOS = 6
+
+ABAS_RELATORIO = ('compras', 'custos', 'receb')
+
+# colunas calculadas a partir das outras (calendario.py, embalagens.py): não entram no hash
+COLUNAS_DERIVADAS = ['Ano', 'Mes', 'Semana', 'InicioSemana', 'UNIDADES', 'LITROS', 'CUSTO UNIDADE', 'CUSTO LITRO']
+
+
+def _hash_por_linha(df):
+    """Hash de cada linha só com as colunas de origem e datas em ns.
+
+    A unidade do datetime64 muda com a fonte (planilha, cache Parquet,
+    SQLite) sem que as datas mudem; o hash não pode mudar junto.
+    """
+    origem = df.drop(columns=COLUNAS_DERIVADAS, errors='ignore')
+    datas = origem.select_dtypes('datetime').columns
+    origem = origem.astype({col: 'datetime64[ns]' for col in datas})
+    return pd.util.hash_pandas_object(origem, index=False)
+
+
+def _hash_linhas(df):
+    """Hash por linha; ordenado para não depender da ordem das linhas na planilha."""
+    return np.sort(_hash_por_linha(df).to_numpy())
+
+
+def hashes_por_mes(dados):
+    """{(ano, mes): hash} das linhas de compras, custos e recebimentos de cada mês."""
+    partes = {}
+    for nome in ABAS_RELATORIO:
+        df = dados[nome]
+        if df.empty or 'Ano' not in df.columns:
+            continue
+        linhas = _hash_por_linha(df)
+        for (ano, mes), h in linhas.groupby([df['Ano'], df['Mes']]):
+            partes.setdefault((int(ano), int(mes)), []).append(nome.encode() + np.sort(h.to_numpy()).tobytes())
+    return {chave: _combinar(v) for chave, v in partes.items()}
+
+
+def hash_periodo(dados, data_inicial, data_final):
+    from precos import JANELA_DIAS
+
+    partes = []
+    for nome in ABAS_RELATORIO:
+        df = dados[nome]
+        if df.empty:
+            continue
+        # as altas de preço do período dependem das compras da janela anterior
+        inicio = data_inicial - pd.Timedelta(days=JANELA_DIAS) if nome == 'compras' else data_inicial
+        partes.append(nome.encode() + _hash_linhas(fatia_datas(df, inicio, data_final)).tobytes())
+    return _combinar(partes)
+
+
+def _combinar(partes):
+    h = hashlib.sha256(f'v{VERSAO_RELATORIOS}'.encode())
+    for parte in partes:
+        h.update(parte)
+    return h.hexdigest()
+
+
+def arquivo_da_tarefa(tarefa):
+    tipo = tarefa[0]
+    if tipo == 'mensal':
+        return f"relatorio_{tarefa[1]}_{tarefa[2]}.pdf"
+    if tipo == 'anual':
+        return f"relatorio_anual_{tarefa[1]}.pdf"
+    if tipo == 'periodo':
+        return f"relatorio_{tarefa[1].strftime('%d%m')}_{tarefa[2].strftime('%d%m')}.pdf"
+    raise ValueError(f"Tarefa desconhecida: {tarefa!r}")
+
+
+def chaves_das_tarefas(tarefas, dados):
+    """Hash das entradas de cada tarefa. O anual combina os hashes de todos os meses do ano."""
+    por_mes = hashes_por_mes(dados)
+    chaves = []
+    for tarefa in tarefas:
+        tipo = tarefa[0]
+        if tipo == 'mensal':
+            chaves.append(por_mes.get((tarefa[1], tarefa[2]), ''))
+        elif tipo == 'anual':
+            meses_ano = sorted((m, h) for (a, m), h in por_mes.items() if a == tarefa[1])
+            chaves.append(_combinar(f'{m}:{h}'.encode() for m, h in meses_ano))
+        else:
+            chaves.append(hash_periodo(dados, tarefa[1], tarefa[2]))
+    return chaves
+
+
+class Manifesto:
+    def __init__(self, output_dir):
+        self.caminho = os.path.join(output_dir, ARQUIVO_MANIFESTO)
+        self.output_dir = output_dir
+        try:
+            with open(self.caminho, encoding='utf-8') as f:
+                self.entradas = json.load(f)
+        except (OSError, ValueError):
+            self.entradas = {}
+
+    def atualizado(self, arquivo, chave):
+        return self.entradas.get(arquivo) == chave and os.path.exists(os.path.join(self.output_dir, arquivo))
+
+    def registrar(self, arquivo, chave):
+        self.entradas[arquivo] = chave
+
+    def salvar(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp = self.caminho + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.entradas, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.caminho)
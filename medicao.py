@@ -0,0 +1,102 @@
+"""Tempo por etapa dos relatórios e perfil opcional.
+
+Cada relatório usa um Cronometro: cronometro.marcar('grafico') soma ao
+'grafico' o tempo desde a marca anterior, então as etapas cobrem o
+relatório inteiro sem sobreposição. Etapas usadas:
+
+    carga        leitura da planilha/banco (cafe_report.py)
+    cubo         montagem dos totais (cafe_report.py)
+    filtro       recorte das linhas por data
+    agrupamento  somas por tipo/fonte e totais do cubo
+    grafico      renderização do matplotlib
+    imagem       pdf.image (parse do SVG/PNG) e logo da capa
+    layout       textos e páginas do fpdf
+    saida        pdf.output (compressão e gravação)
+
+No fim, registrar() acrescenta uma linha JSON ao arquivo de métricas
+(um objeto por relatório ou execução, com 'etapas' em segundos), que dá
+para abrir com pandas.read_json(..., lines=True). A gravação é opcional:
+só acontece quando quem chama passa o destino (cafe_report.py --metricas,
+CAFE_METRICAS ou --perfil); sem destino nada é escrito.
+
+CAFE_PERFIL=cprofile (ou pyinstrument, se instalado) grava também o
+perfil de cada relatório em perfis/; cafe_report.py --perfil faz o mesmo.
+"""
+import contextlib
+import datetime
+import json
+import os
+import time
+
+ARQUIVO_METRICAS = 'relatorio_metricas.jsonl'
+PASTA_PERFIS = 'perfis'
+
+
+class Cronometro:
+    def __init__(self, evento, destino=None, **campos):
+        """destino: arquivo .jsonl das métricas; None mede sem gravar."""
+        self.evento = evento
+        self.destino = destino
+        self.campos = campos
+        self.etapas = {}
+        self.inicio = self.ultima = time.perf_counter()
+
+    def marcar(self, etapa):
+        agora = time.perf_counter()
+        self.etapas[etapa] = self.etapas.get(etapa, 0.0) + agora - self.ultima
+        self.ultima = agora
+
+    def registrar(self, **campos):
+        """Linha JSON desta medição, acrescentada ao destino se houver um."""
+        linha = {
+            'quando': datetime.datetime.now().isoformat(timespec='seconds'),
+            'evento': self.evento,
+            **self.campos,
+            **campos,
+            'pid': os.getpid(),
+            'total': round(self.ultima - self.inicio, 4),
+            'etapas': {etapa: round(dt, 4) for etapa, dt in self.etapas.items()},
+        }
+        if self.destino is None:
+            return linha
+        # uma única escrita em modo append: linhas de processos do lote não se misturam
+        with open(self.destino, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(linha, ensure_ascii=False, default=str) + '\n')
+        return linha
+
+
+@contextlib.contextmanager
+def perfilar(nome):
+    """Perfil do bloco em perfis/<nome>.prof (cProfile) ou .html (pyinstrument), se CAFE_PERFIL pedir."""
+    modo = os.environ.get('CAFE_PERFIL', '').lower()
+    if not modo:
+        yield
+        return
+
+    os.makedirs(PASTA_PERFIS, exist_ok=True)
+    caminho = os.path.join(PASTA_PERFIS, nome)
+    if modo == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("Aviso: pyinstrument não instalado; usando cProfile.")
+        else:
+            perfil = Profiler()
+            perfil.start()
+            try:
+                yield
+            finally:
+                perfil.stop()
+                with open(caminho + '.html', 'w', encoding='utf-8') as f:
+                    f.write(perfil.output_html())
+            return
+
+    import cProfile
+
+    perfil = cProfile.Profile()
+    perfil.enable()
+    try:
+        yield
+    finally:
+        perfil.disable()
+        perfil.dump_stats(caminho + '.prof')
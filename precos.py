@@ -0,0 +1,163 @@
+"""Histórico do preço unitário (VALOR UND) por item e alertas de alta.
+
+Para cada compra, as estatísticas do preço do mesmo item (ItemId, ver
+catalogo.py) nos JANELA_DIAS dias anteriores, sem contar o próprio dia:
+mediana, mínimo, máximo, média, desvio e quantas compras entraram na
+conta. A partir delas, z (desvios acima da média) e variacao (preço /
+mediana - 1). A compra é uma alta quando o item tem histórico suficiente
+e o preço passou LIMITE_ALTA acima da mediana.
+
+Tudo sai de um groupby(...).rolling por janela de tempo, sem laço por
+item. Sem o banco, estatisticas_precos roda sobre a aba de compras
+carregada. Com o banco, a tabela historico_precos guarda essas colunas e
+é acertada a cada importação só para os itens com compras novas ou
+removidas, e só nas datas que a janela alcança; "altas desta semana" é
+uma consulta pelo índice de data.
+"""
+import pandas as pd
+
+from banco import TabelasDoBanco, colunas_da_tabela, conectar
+from dados import fatia_datas
+
+JANELA_DIAS = 90
+MIN_HISTORICO = 3
+LIMITE_ALTA = 0.20
+
+COLUNAS = ['ItemId', 'item', 'Data', 'preco', 'historico', 'mediana', 'minimo', 'maximo',
+           'media', 'desvio', 'z', 'variacao', 'alta']
+
+
+def estatisticas_precos(compras):
+    """Uma linha por compra com preço: COLUNAS (mais a chave, se houver), indexada e ordenada por data."""
+    extras = [c for c in ('chave',) if c in compras.columns]
+    df = compras[['ItemId', 'Itens', 'Data', 'VALOR UND', *extras]].dropna(subset=['ItemId', 'Data', 'VALOR UND'])
+    df = df.sort_values(['ItemId', 'Data'], kind='stable', ignore_index=True)
+    preco = df['VALOR UND'].astype('float64')
+
+    # o groupby devolve os grupos em ordem de ItemId e, dentro deles, na ordem das linhas: a mesma do df
+    janela = preco.set_axis(pd.DatetimeIndex(df['Data'])).groupby(df['ItemId'].to_numpy()).rolling(
+        f'{JANELA_DIAS}D', closed='left')
+    resultado = pd.DataFrame({
+        'ItemId': df['ItemId'],
+        'item': df['Itens'].astype(str).str.strip(),
+        'Data': df['Data'],
+        'preco': df['VALOR UND'].astype('Int64'),
+        'historico': janela.count().fillna(0).astype('int32').to_numpy(),
+        'mediana': janela.median().to_numpy(),
+        'minimo': janela.min().to_numpy(),
+        'maximo': janela.max().to_numpy(),
+        'media': janela.mean().to_numpy(),
+        'desvio': janela.std().to_numpy(),
+    })
+    for col in extras:
+        resultado[col] = df[col]
+    desvio = resultado['desvio'].where(resultado['desvio'] > 0)
+    resultado['z'] = (preco - resultado['media']) / desvio
+    resultado['variacao'] = preco / resultado['mediana'] - 1
+    resultado['alta'] = (resultado['historico'] >= MIN_HISTORICO) & (resultado['variacao'] >= LIMITE_ALTA)
+
+    resultado = resultado.sort_values('Data', kind='stable', ignore_index=True)
+    resultado.index = pd.DatetimeIndex(resultado['Data']).rename(None)
+    return resultado
+
+
+def altas_de_preco(historico, inicio, fim):
+    """Compras de inicio a fim com preço em alta, indexadas por data (para fatia_datas)."""
+    periodo = fatia_datas(historico, inicio, fim)
+    return periodo[periodo['alta']]
+
+
+# ---- banco ----------------------------------------------------------------
+
+def _criar_tabela(con):
+    con.execute('''CREATE TABLE IF NOT EXISTS historico_precos (
+        chave TEXT PRIMARY KEY, ItemId INTEGER NOT NULL, item TEXT, Data TEXT NOT NULL,
+        preco INTEGER NOT NULL, historico INTEGER NOT NULL, mediana REAL, minimo REAL, maximo REAL,
+        media REAL, desvio REAL, z REAL, variacao REAL, alta INTEGER NOT NULL)''')
+    con.execute('CREATE INDEX IF NOT EXISTS historico_precos_data ON historico_precos (Data)')
+    con.execute('CREATE INDEX IF NOT EXISTS historico_precos_item ON historico_precos (ItemId, Data)')
+
+
+def atualizar_historico(con):
+    """Acerta historico_precos com as compras novas/removidas; devolve (inseridas, removidas).
+
+    Uma compra mexe nas estatísticas do mesmo item até JANELA_DIAS depois
+    dela; por item, só o trecho da primeira compra alterada até JANELA_DIAS
+    depois da última é recalculado, com os JANELA_DIAS anteriores como
+    contexto. Roda na transação de banco.importar_planilhas.
+    """
+    _criar_tabela(con)
+    if not colunas_da_tabela(con, 'compras'):
+        return 0, 0
+    alterados = {}  # item -> (primeira, última) data com compra nova/removida
+    consultas = [
+        f'''SELECT ItemId, MIN(Data), MAX(Data) FROM compras
+            WHERE ItemId IS NOT NULL AND Data IS NOT NULL AND "VALOR UND" IS NOT NULL
+              AND chave NOT IN (SELECT chave FROM historico_precos) GROUP BY ItemId''',
+        '''SELECT ItemId, MIN(Data), MAX(Data) FROM historico_precos
+           WHERE chave NOT IN (SELECT chave FROM compras) GROUP BY ItemId''',
+    ]
+    for sql in consultas:
+        for item_id, primeira, ultima in con.execute(sql):
+            if item_id in alterados:
+                primeira, ultima = min(primeira, alterados[item_id][0]), max(ultima, alterados[item_id][1])
+            alterados[item_id] = (primeira, ultima)
+    if not alterados:
+        return 0, 0
+
+    con.execute('CREATE TEMP TABLE IF NOT EXISTS precos_alterados (ItemId INTEGER PRIMARY KEY, desde TEXT, ate TEXT)')
+    con.execute('DELETE FROM precos_alterados')
+    janela = pd.Timedelta(days=JANELA_DIAS)
+    trechos = {item_id: (pd.Timestamp(primeira), pd.Timestamp(ultima) + janela)
+               for item_id, (primeira, ultima) in alterados.items()}
+    con.executemany('INSERT INTO precos_alterados VALUES (?, ?, ?)',
+                    [(item_id, desde.strftime('%Y-%m-%d'), ate.strftime('%Y-%m-%d'))
+                     for item_id, (desde, ate) in trechos.items()])
+    removidas = con.execute('''DELETE FROM historico_precos WHERE rowid IN (
+        SELECT h.rowid FROM historico_precos h JOIN precos_alterados a ON h.ItemId = a.ItemId
+        WHERE h.Data BETWEEN a.desde AND a.ate)''').rowcount
+
+    compras = pd.read_sql_query(f'''
+        SELECT c.chave, c.ItemId, c.Itens, c.Data, c."VALOR UND" FROM compras c
+        JOIN precos_alterados a ON c.ItemId = a.ItemId
+        WHERE c.ItemId IS NOT NULL AND c.Data IS NOT NULL AND c."VALOR UND" IS NOT NULL
+          AND c.Data BETWEEN date(a.desde, '-{JANELA_DIAS} days') AND a.ate''', con)
+    compras['Data'] = pd.to_datetime(compras['Data'])
+    estatisticas = estatisticas_precos(compras)
+    inicio = estatisticas['ItemId'].map(lambda i: trechos[i][0])
+    fim = estatisticas['ItemId'].map(lambda i: trechos[i][1])
+    estatisticas = estatisticas[(estatisticas['Data'] >= inicio) & (estatisticas['Data'] <= fim)]
+
+    linhas = estatisticas[['chave', *COLUNAS]].astype(object)
+    linhas = linhas.where(linhas.notna(), None)
+    linhas['Data'] = estatisticas['Data'].dt.strftime('%Y-%m-%d')
+    linhas['alta'] = estatisticas['alta'].astype(int)
+    con.executemany(f'INSERT INTO historico_precos (chave, {", ".join(COLUNAS)}) VALUES ({", ".join("?" * (len(COLUNAS) + 1))})',
+                    linhas.values.tolist())
+    return len(linhas), removidas
+
+
+def altas_no_banco(con, inicio, fim):
+    """Mesmo resultado de altas_de_preco, lido de historico_precos pelo índice de data."""
+    df = pd.read_sql_query(
+        f'SELECT {", ".join(COLUNAS)} FROM historico_precos WHERE alta = 1 AND Data BETWEEN ? AND ? '
+        'ORDER BY Data, ItemId, rowid', con,
+        params=(pd.Timestamp(inicio).strftime('%Y-%m-%d'), pd.Timestamp(fim).strftime('%Y-%m-%d')))
+    df['Data'] = pd.to_datetime(df['Data'])
+    df['preco'] = df['preco'].astype('Int64')
+    df['alta'] = df['alta'].astype(bool)
+    df.index = pd.DatetimeIndex(df['Data']).rename(None)
+    return df
+
+
+def altas_da_semana(dados, inicio, fim):
+    """Altas de preço de inicio a fim, do banco (TabelasDoBanco) ou calculadas das compras carregadas."""
+    if isinstance(dados, TabelasDoBanco):
+        con = conectar(dados.caminho)
+        try:
+            return altas_no_banco(con, inicio, fim)
+        finally:
+            con.close()
+    # só a janela que alcança o período entra na conta
+    compras = fatia_datas(dados['compras'], pd.Timestamp(inicio) - pd.Timedelta(days=JANELA_DIAS), fim)
+    return altas_de_preco(estatisticas_precos(compras), inicio, fim)
@@ -0,0 +1,435 @@
+"""Geradores de relatório em PDF (mensal, anual e por período).
+
+As funções ficam aqui para poderem ser importadas pelos scripts de
+execução e pelos processos do gerador em lote (lote.py). Os valores
+chegam em centavos (esquema.py) e só viram reais na formatação e nos
+gráficos. Com metricas (caminho de um .jsonl), cada relatório registra
+ali o tempo por etapa (medicao.py).
+"""
+import calendar
+import os
+from datetime import date
+
+import pandas as pd
+
+from dados import fatia_datas
+from esquema import em_reais
+from graficos import formatar_centavos, grafico_barras, grafico_barras_resumo, grafico_pizza
+from medicao import Cronometro
+from modelo_pdf import PDF
+
+# Cores padrão
+cores = ['#1f77b4', '#2ca02c', '#d62728']
+
+# Cores atualizadas para gráficos de barras
+cor_comprado = '#F4A261'  # laranja suave
+cor_custos = '#E9C46A'    # amarelo queimado
+cor_recebido = '#2A9D8F'  # verde esmeralda
+cor_saldo_pos = '#264653' # azul petróleo
+cor_saldo_neg = '#E76F51' # vermelho terracota
+
+# Dicionário para tradução dos meses
+meses = {
+    1: 'Janeiro', 2: 'Fevereiro', 3: 'Março', 4: 'Abril',
+    5: 'Maio', 6: 'Junho', 7: 'Julho', 8: 'Agosto',
+    9: 'Setembro', 10: 'Outubro', 11: 'Novembro', 12: 'Dezembro'
+}
+
+def log_sucesso(mensagem, arquivo="relatorio.log"):
+    print(mensagem)
+    with open(arquivo, "a", encoding="utf-8") as log:
+        log.write(mensagem + "\n")
+
+def log_erro(erro, arquivo="relatorio_erro.log"):
+    print(f"Erro: {erro}")
+    with open(arquivo, "a", encoding="utf-8") as log:
+        log.write(erro + "\n")
+
+def gerar_relatorio_mensal(cubo, ano, mes, output_dir='relatorios', metricas=None):
+    if not cubo.tem_dados('compras', ano, mes):
+        print(f"Nenhum dado de compras para {mes}/{ano}")
+        return
+
+    cronometro = Cronometro('relatorio', metricas, relatorio='mensal', ano=ano, mes=mes)
+    os.makedirs(output_dir, exist_ok=True)
+    nome_mes = meses.get(mes, f"Mês {mes}")
+
+    pdf = PDF(date(ano, mes, calendar.monthrange(ano, mes)[1]))
+    pdf.capa(f'Relatório - {nome_mes}')
+    cronometro.marcar('imagem')
+
+    total_mes, total_custos, total_receb = cubo.totais_mes(ano, mes)
+    saldo = total_receb - (total_mes + total_custos)
+
+    semanas = cubo.semanas(ano, mes)
+    cronometro.marcar('agrupamento')
+
+    for idx, semana in enumerate(semanas, 1):
+        pdf.add_page()
+        pdf.set_font("Arial", 'B', 14)
+        pdf.cell(0, 10, f"Semana {idx} de {nome_mes}", ln=True)
+        cronometro.marcar('layout')
+
+        resumo_tipo = cubo.resumo('compras', ano, mes, semana)
+        cronometro.marcar('agrupamento')
+
+        grafico = grafico_barras(em_reais(resumo_tipo, 'TOTAL'), f'Compras - Semana {idx}', 'tipo', 'TOTAL', cores)
+        cronometro.marcar('grafico')
+        pdf.image(grafico, x=10, y=None, w=180)
+        cronometro.marcar('imagem')
+
+        pdf.ln(5)
+        pdf.set_font("Arial", 'B', 12)
+        pdf.cell(0, 8, 'Resumo:', ln=True)
+
+        for _, row in resumo_tipo.iterrows():
+            pdf.set_font("Arial", '', 12)
+            pdf.write(5, f"{row['tipo']}: ")
+            pdf.set_font("Arial", 'B', 12)
+            pdf.write(5, f"{formatar_centavos(row['TOTAL'])} (")
+            pdf.set_text_color(0, 0, 255)
+            pdf.write(5, f"{row['PERCENTUAL']:.1f}%")
+            pdf.set_text_color(0, 0, 0)
+            pdf.write(5, ")\n")
+        cronometro.marcar('layout')
+
+    for titulo, nome, col_tipo, col_valor in [
+        ('Custos', 'custos', 'TIPO', 'VALOR'),
+        ('Recebimentos', 'receb', 'Fonte', 'VALOR')
+    ]:
+        if cubo.tem_dados(nome, ano, mes):
+            pdf.add_page()
+            pdf.set_font("Arial", 'B', 14)
+            pdf.cell(0, 10, f'{titulo} - Consolidado do Mês', ln=True)
+            cronometro.marcar('layout')
+
+            resumo = cubo.resumo(nome, ano, mes)
+            cronometro.marcar('agrupamento')
+
+            grafico = grafico_pizza(resumo, f'{titulo} - {nome_mes}', col_valor, col_tipo, cores)
+            cronometro.marcar('grafico')
+            if grafico is not None:
+                pdf.image(grafico, x=30, y=None, w=150)
+                cronometro.marcar('imagem')
+
+            pdf.ln(5)
+            pdf.set_font("Arial", 'B', 12)
+            pdf.cell(0, 8, 'Resumo:', ln=True)
+
+            for _, row in resumo.iterrows():
+                pdf.set_font("Arial", '', 12)
+                pdf.write(5, f"{row[col_tipo]}: {formatar_centavos(row[col_valor])} (")
+                pdf.set_text_color(0, 0, 255)
+                pdf.set_font("Arial", 'B', 12)
+                pdf.write(5, f"{row['PERCENTUAL']:.1f}%")
+                pdf.set_text_color(0, 0, 0)
+                pdf.write(5, ")\n")
+            cronometro.marcar('layout')
+
+    pdf.add_page()
+    pdf.set_font("Arial", 'B', 14)
+    pdf.cell(0, 10, 'Fechamento do Mês', ln=True)
+    pdf.set_font("Arial", '', 12)
+
+    for label, value, color in [
+        ("Total Comprado: ", total_mes, (255, 0, 0)),
+        ("Total Custos: ", total_custos, (255, 0, 0)),
+        ("Total Recebido: ", total_receb, (0, 0, 255))
+    ]:
+        pdf.set_text_color(0, 0, 0)
+        pdf.write(5, label)
+        pdf.set_text_color(*color)
+        pdf.set_font("Arial", 'B', 12)
+        pdf.write(5, f"{formatar_centavos(value)}\n")
+
+    pdf.set_text_color(0, 0, 0)
+    pdf.write(5, "Saldo do Fechamento: ")
+    if saldo >= 0:
+        pdf.set_text_color(0, 0, 255)
+    else:
+        pdf.set_text_color(255, 0, 0)
+    pdf.set_font("Arial", 'B', 12)
+    pdf.write(5, f"{formatar_centavos(saldo)}\n")
+
+    pdf_file = f"{output_dir}/relatorio_{ano}_{mes}.pdf"
+    cronometro.marcar('layout')
+    pdf.output(pdf_file)
+    cronometro.marcar('saida')
+    cronometro.registrar(pdf=pdf_file, paginas=pdf.pages_count)
+    log_sucesso(f"Relatório gerado: {pdf_file}")
+
+def gerar_relatorio_anual(cubo, ano, output_dir='relatorios', metricas=None):
+    cronometro = Cronometro('relatorio', metricas, relatorio='anual', ano=ano)
+    os.makedirs(output_dir, exist_ok=True)
+    pdf = PDF(date(ano, 12, 31))
+    pdf.capa(f'Relatório Anual - {ano}')
+    cronometro.marcar('imagem')
+
+    total_compras, total_custos, total_receb = 0, 0, 0
+    resumo_meses = []
+
+    for mes in cubo.meses(ano):
+        nome_mes = meses[mes]
+        total_mes, total_cust, total_rec = cubo.totais_mes(ano, mes)
+        saldo = total_rec - (total_mes + total_cust)
+        cronometro.marcar('agrupamento')
+
+        resumo_meses.append({
+            'Mês': nome_mes,
+            'Compras': total_mes,
+            'Custos': total_cust,
+            'Recebimentos': total_rec,
+            'Saldo': saldo
+        })
+
+        total_compras += total_mes
+        total_custos += total_cust
+        total_receb += total_rec
+
+        pdf.add_page()
+        pdf.set_fill_color(240, 240, 240)
+        pdf.set_font("Arial", 'B', 14)
+        pdf.cell(0, 8, f"{nome_mes}", ln=True, fill=True)
+
+        for label, value, color in [
+            ("Total Comprado: ", total_mes, (244, 162, 97)),
+            ("Total Custos: ", total_cust, (233, 196, 106)),
+            ("Total Recebido: ", total_rec, (42, 157, 143))
+        ]:
+            pdf.set_text_color(0, 0, 0)
+            pdf.set_font("Arial", '', 12)
+            pdf.write(5, label)
+            pdf.set_text_color(*color)
+            pdf.set_font("Arial", 'B', 12)
+            pdf.write(5, f"{formatar_centavos(value)}\n")
+
+        pdf.set_text_color(0, 0, 0)
+        pdf.write(5, "Saldo do Mês: ")
+        cor_saldo = (38, 70, 83) if saldo >= 0 else (231, 111, 81)
+        pdf.set_text_color(*cor_saldo)
+        pdf.set_font("Arial", 'B', 12)
+        pdf.write(5, f"{formatar_centavos(saldo)}\n")
+
+        valores = [v / 100 for v in (total_mes, total_cust, total_rec, abs(saldo))]
+        cores_barras = [cor_comprado, cor_custos, cor_recebido, cor_saldo_pos if saldo >=0 else cor_saldo_neg]
+        labels = ['Comprado', 'Custos', 'Recebido', 'Saldo']
+        cronometro.marcar('layout')
+        grafico = grafico_barras_resumo(valores, labels, cores_barras, f"{nome_mes} - Resumo")
+        cronometro.marcar('grafico')
+        pdf.image(grafico, x=15, y=None, w=180)
+        cronometro.marcar('imagem')
+
+        comentario = f"{nome_mes}: Saldo {'positivo' if saldo >=0 else 'negativo'} de {formatar_centavos(saldo)}."
+        pdf.set_text_color(0, 0, 0)
+        pdf.set_font("Arial", 'I', 11)
+        pdf.multi_cell(0, 6, comentario)
+        cronometro.marcar('layout')
+
+    pdf.add_page()
+    pdf.set_font("Arial", 'B', 16)
+    pdf.cell(0, 10, f'Resumo Anual - {ano}', ln=True)
+
+    for i, item in enumerate(resumo_meses):
+        pdf.set_font("Arial", 'B', 13)
+        pdf.cell(0, 8, item['Mês'], ln=True)
+        pdf.set_font("Arial", '', 12)
+        pdf.write(5, f"Total Comprado: {formatar_centavos(item['Compras'])}\n")
+        pdf.write(5, f"Total Custos: {formatar_centavos(item['Custos'])}\n")
+        pdf.write(5, f"Total Recebido: {formatar_centavos(item['Recebimentos'])}\n")
+        pdf.write(5, f"Saldo: {formatar_centavos(item['Saldo'])}\n")
+
+        if i > 0:
+            delta = item['Saldo'] - resumo_meses[i - 1]['Saldo']
+            perc = (delta / abs(resumo_meses[i - 1]['Saldo'])) * 100 if resumo_meses[i - 1]['Saldo'] != 0 else 0
+            pdf.set_text_color(100, 100, 100)
+            texto = f"Crescimento mensal: {formatar_centavos(delta)} ({perc:.1f}%)\n"
+            pdf.set_font("Arial", 'I', 11)
+            pdf.write(5, texto)
+            pdf.set_text_color(0, 0, 0)
+
+    pdf.add_page()
+    pdf.set_font("Arial", 'B', 16)
+    pdf.cell(0, 10, f'Fechamento do Ano - {ano}', ln=True)
+
+    saldo_anual = total_receb - (total_compras + total_custos)
+
+    for label, value, color in [
+        ("Total Comprado: ", total_compras, (244, 162, 97)),
+        ("Total Custos: ", total_custos, (233, 196, 106)),
+        ("Total Recebido: ", total_receb, (42, 157, 143))
+    ]:
+        pdf.set_text_color(0, 0, 0)
+        pdf.write(5, label)
+        pdf.set_text_color(*color)
+        pdf.set_font("Arial", 'B', 12)
+        pdf.write(5, f"{formatar_centavos(value)}\n")
+
+    pdf.set_text_color(0, 0, 0)
+    pdf.write(5, "Saldo do Ano: ")
+    pdf.set_text_color(*(38, 70, 83) if saldo_anual >= 0 else (231, 111, 81))
+    pdf.set_font("Arial", 'B', 12)
+    pdf.write(5, f"{formatar_centavos(saldo_anual)}\n")
+
+    valores = [v / 100 for v in (total_compras, total_custos, total_receb, abs(saldo_anual))]
+    cores_barras = [cor_comprado, cor_custos, cor_recebido, cor_saldo_pos if saldo_anual >=0 else cor_saldo_neg]
+    labels = ['Comprado', 'Custos', 'Recebido', 'Saldo']
+    cronometro.marcar('layout')
+    grafico = grafico_barras_resumo(valores, labels, cores_barras, f"Resumo Anual {ano}")
+    cronometro.marcar('grafico')
+    pdf.image(grafico, x=15, y=None, w=180)
+    cronometro.marcar('imagem')
+
+    pdf_file = f"{output_dir}/relatorio_anual_{ano}.pdf"
+    pdf.output(pdf_file)
+    cronometro.marcar('saida')
+    cronometro.registrar(pdf=pdf_file, paginas=pdf.pages_count)
+    log_sucesso(f"Relatório Anual gerado: relatorio_anual_{ano}.pdf", "relatorio_anual.log")
+
+def gerar_relatorio_periodo(compras_df, custos_df, receb_df, data_inicial, data_final, output_dir='relatorios',
+                            altas=None, metricas=None):
+    """altas: compras com preço em alta no período (precos.altas_da_semana), listadas em cada semana."""
+    cronometro = Cronometro('relatorio', metricas, relatorio='periodo', inicio=data_inicial.date(),
+                            fim=data_final.date())
+    # os DataFrames vêm de dados.carregar_planilhas, ordenados e indexados por data
+    dados_periodo = fatia_datas(compras_df, data_inicial, data_final)
+    custos_periodo = fatia_datas(custos_df, data_inicial, data_final)
+    receb_periodo = fatia_datas(receb_df, data_inicial, data_final)
+    cronometro.marcar('filtro')
+
+    if dados_periodo.empty:
+        print("Nenhum dado de compras no período informado.")
+        return
+
+    os.makedirs(output_dir, exist_ok=True)
+    pdf = PDF(data_final)
+    pdf.capa(f'Relatório - {data_inicial.strftime("%d/%m/%Y")} a {data_final.strftime("%d/%m/%Y")}')
+    cronometro.marcar('imagem')
+
+    total_compras = dados_periodo['TOTAL'].sum()
+    total_custos = custos_periodo['VALOR'].sum()
+    total_receb = receb_periodo['VALOR'].sum()
+    saldo = total_receb - (total_compras + total_custos)
+
+    semanas = sorted(dados_periodo['InicioSemana'].unique())
+    cronometro.marcar('agrupamento')
+
+    for idx, data_inicio_semana in enumerate(semanas, 1):
+        data_inicio_semana = pd.Timestamp(data_inicio_semana)
+        data_fim_semana = data_inicio_semana + pd.Timedelta(days=6)
+
+        semana_data = fatia_datas(dados_periodo, data_inicio_semana, data_fim_semana)
+        custos_semana = fatia_datas(custos_periodo, data_inicio_semana, data_fim_semana)
+        receb_semana = fatia_datas(receb_periodo, data_inicio_semana, data_fim_semana)
+        cronometro.marcar('filtro')
+
+        pdf.add_page()
+        pdf.set_font("Arial", 'B', 14)
+        pdf.cell(0, 10, f"Semana {idx} ({data_inicio_semana.strftime('%d/%m/%Y')} a {data_fim_semana.strftime('%d/%m/%Y')})", ln=True)
+        cronometro.marcar('layout')
+
+        resumo_tipo = semana_data.groupby('tipo', observed=True).agg({'TOTAL': 'sum'}).reset_index()
+        cronometro.marcar('agrupamento')
+        if not resumo_tipo.empty:
+            resumo_tipo['PERCENTUAL'] = resumo_tipo['TOTAL'] / resumo_tipo['TOTAL'].sum() * 100
+            resumo_tipo = resumo_tipo.sort_values(by='PERCENTUAL', ascending=False)
+            total_semana = semana_data['TOTAL'].sum()
+            cronometro.marcar('agrupamento')
+
+            grafico = grafico_barras(em_reais(resumo_tipo, 'TOTAL'), f'Compras - Semana {idx}', 'tipo', 'TOTAL', cores)
+            cronometro.marcar('grafico')
+            pdf.image(grafico, x=10, y=None, w=180)
+            cronometro.marcar('imagem')
+
+            pdf.ln(5)
+            pdf.set_font("Arial", 'B', 12)
+            pdf.cell(0, 8, 'Resumo:', ln=True)
+
+            for _, row in resumo_tipo.iterrows():
+                pdf.set_font("Arial", '', 12)
+                pdf.write(5, f"{row['tipo']}: ")
+                pdf.set_font("Arial", 'B', 12)
+                pdf.write(5, f"{formatar_centavos(row['TOTAL'])} (")
+                pdf.set_text_color(0, 0, 255)
+                pdf.write(5, f"{row['PERCENTUAL']:.1f}%")
+                pdf.set_text_color(0, 0, 0)
+                pdf.write(5, ")\n")
+
+            pdf.set_font("Arial", 'B', 12)
+            pdf.ln(3)
+            pdf.cell(0, 8, f"Total da Semana: {formatar_centavos(total_semana)}", ln=True)
+            cronometro.marcar('layout')
+
+        if not custos_semana.empty:
+            resumo_custos = custos_semana.groupby('TIPO', observed=True).agg({'VALOR': 'sum'}).reset_index()
+            cronometro.marcar('agrupamento')
+            pdf.set_font("Arial", 'B', 12)
+            pdf.cell(0, 8, 'Custos da Semana:', ln=True)
+            for _, row in resumo_custos.iterrows():
+                pdf.set_font("Arial", '', 12)
+                pdf.cell(0, 8, f"- {row['TIPO']}: {formatar_centavos(row['VALOR'])}", ln=True)
+            cronometro.marcar('layout')
+
+        if not receb_semana.empty:
+            resumo_receb = receb_semana.groupby('Fonte', observed=True).agg({'VALOR': 'sum'}).reset_index()
+            cronometro.marcar('agrupamento')
+            pdf.set_font("Arial", 'B', 12)
+            pdf.cell(0, 8, 'Recebimentos da Semana:', ln=True)
+            for _, row in resumo_receb.iterrows():
+                pdf.set_font("Arial", '', 12)
+                pdf.cell(0, 8, f"- {row['Fonte']}: {formatar_centavos(row['VALOR'])}", ln=True)
+            cronometro.marcar('layout')
+
+        altas_semana = fatia_datas(altas, data_inicio_semana, data_fim_semana) if altas is not None else None
+        cronometro.marcar('filtro')
+        if altas_semana is not None and not altas_semana.empty:
+            pdf.set_font("Arial", 'B', 12)
+            pdf.cell(0, 8, 'Preços em Alta:', ln=True)
+            pdf.set_font("Arial", '', 12)
+            for _, row in altas_semana.sort_values('variacao', ascending=False, kind='stable').iterrows():
+                pdf.cell(0, 8, f"- {row['item']}: {formatar_centavos(row['preco'])} "
+                               f"(mediana {formatar_centavos(round(row['mediana']))}, +{row['variacao'] * 100:.0f}%)", ln=True)
+            cronometro.marcar('layout')
+
+    pdf.add_page()
+    pdf.set_font("Arial", 'B', 14)
+    pdf.cell(0, 10, 'Fechamento do Período', ln=True)
+    pdf.set_font("Arial", '', 12)
+
+    for label, value, color in [
+        ("Total Comprado: ", total_compras, (255, 0, 0)),
+        ("Total Custos: ", total_custos, (255, 0, 0)),
+        ("Total Recebido: ", total_receb, (0, 0, 255))
+    ]:
+        pdf.set_text_color(0, 0, 0)
+        pdf.write(5, label)
+        pdf.set_text_color(*color)
+        pdf.set_font("Arial", 'B', 12)
+        pdf.write(5, f"{formatar_centavos(value)}\n")
+
+    pdf.set_text_color(0, 0, 0)
+    pdf.write(5, "Saldo do Fechamento: ")
+    if saldo >= 0:
+        pdf.set_text_color(0, 0, 255)
+    else:
+        pdf.set_text_color(255, 0, 0)
+    pdf.set_font("Arial", 'B', 12)
+    pdf.write(5, f"{formatar_centavos(saldo)}\n")
+
+    resumo_final = pd.DataFrame({
+        'Categoria': ['Compras', 'Custos', 'Recebido', 'Saldo'],
+        'Valor': [total_compras, total_custos, total_receb, saldo]
+    })
+
+    cronometro.marcar('layout')
+
+    grafico_final = grafico_pizza(resumo_final, 'Fechamento do Período', 'Valor', 'Categoria')
+    cronometro.marcar('grafico')
+    if grafico_final is not None:
+        pdf.image(grafico_final, x=30, y=None, w=150)
+        cronometro.marcar('imagem')
+
+    pdf_file = f"{output_dir}/relatorio_{data_inicial.strftime('%d%m')}_{data_final.strftime('%d%m')}.pdf"
+    pdf.output(pdf_file)
+    cronometro.marcar('saida')
+    cronometro.registrar(pdf=pdf_file, paginas=pdf.pages_count)
+    log_sucesso(f"Relatório gerado: {pdf_file}")
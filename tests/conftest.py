@@ -0,0 +1,25 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'benchmarks'))
+
+from planilha_sintetica import gerar_planilha  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def _planilha_gerada(tmp_path_factory):
+    caminho = str(tmp_path_factory.mktemp('sintetica') / 'itens.xlsx')
+    gerar_planilha(caminho, escala=0.2, anos=1, semente=0)
+    return caminho
+
+
+@pytest.fixture
+def planilha(_planilha_gerada, tmp_path, monkeypatch):
+    """itens.xlsx sintético numa pasta própria do teste, que vira a pasta atual."""
+    shutil.copy(_planilha_gerada, tmp_path / 'itens.xlsx')
+    monkeypatch.chdir(tmp_path)
+    return str(tmp_path / 'itens.xlsx')
@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from agregacao import MEDIDAS, Cubo
+from dados import carregar_planilhas
+
+
+@pytest.fixture
+def dados(planilha):
+    return carregar_planilhas(planilha)
+
+
+@pytest.fixture
+def cubo(dados):
+    return Cubo(dados['compras'], dados['custos'], dados['receb'])
+
+
+@pytest.mark.parametrize('nome', list(MEDIDAS))
+def test_totais_iguais_ao_groupby(dados, cubo, nome):
+    col_cat, col_valor = MEDIDAS[nome]
+    df = dados[nome]
+    por_mes = df.groupby(['Ano', 'Mes'])[col_valor].sum()
+    assert cubo.total_mes[nome] == {(int(a), int(m)): int(t) for (a, m), t in por_mes.items()}
+    por_semana = df.groupby(['Ano', 'Mes', 'InicioSemana'])[col_valor].sum()
+    assert cubo.total_semana[nome] == {(int(a), int(m), s): int(t) for (a, m, s), t in por_semana.items()}
+
+    for (ano, mes), grupo in df.groupby(['Ano', 'Mes']):
+        esperado = grupo.groupby(col_cat, observed=True)[col_valor].sum()
+        resumo = cubo.resumo(nome, int(ano), int(mes)).set_index(col_cat)[col_valor]
+        pd.testing.assert_series_equal(resumo.sort_index(), esperado.sort_index(), check_names=False,
+                                       check_index_type=False, check_categorical=False)
+
+
+def test_resumo_da_semana(dados, cubo):
+    compras = dados['compras']
+    ano, mes = int(compras['Ano'].iloc[-1]), int(compras['Mes'].iloc[-1])
+    for semana in cubo.semanas(ano, mes):
+        linhas = compras[(compras['Ano'] == ano) & (compras['Mes'] == mes) & (compras['InicioSemana'] == semana)]
+        resumo = cubo.resumo('compras', ano, mes, semana)
+        assert resumo['TOTAL'].sum() == linhas['TOTAL'].sum() == cubo.total('compras', ano, mes, semana)
+        assert resumo['PERCENTUAL'].is_monotonic_decreasing
+
+
+def test_mes_sem_dados(cubo):
+    assert cubo.total('compras', 1999, 1) == 0
+    assert cubo.resumo('compras', 1999, 1).empty
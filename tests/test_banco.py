@@ -0,0 +1,68 @@
+"""Importação incremental: o banco atualizado só com as diferenças fica igual a um banco novo."""
+import pandas as pd
+import pytest
+
+import banco
+from agregacao import Cubo
+from banco import conectar, cubo_do_banco, sincronizar
+from dados import ler_excel
+
+
+def _banco_novo(caminho, tabelas):
+    con = conectar(caminho, criar=True)
+    con.execute('BEGIN')
+    banco._conferir_versao(con)
+    for nome, df in tabelas.items():
+        sincronizar(con, nome, df)
+    con.execute('COMMIT')
+    return con
+
+
+def _conteudo(con, tabela, ordem):
+    return pd.read_sql_query(f'SELECT * FROM {banco.aspas(tabela)} ORDER BY {ordem}', con)
+
+
+def _alterar(tabelas):
+    """Remove, repete e corrige linhas, como numa edição da planilha."""
+    compras = tabelas['compras']
+    compras = pd.concat([compras.iloc[5:], compras.iloc[[10]]], ignore_index=True)
+    compras.loc[0, 'TOTAL'] += 100
+    custos = tabelas['custos'].iloc[:-3].reset_index(drop=True)
+    return {**tabelas, 'compras': compras, 'custos': custos}
+
+
+@pytest.fixture
+def tabelas(planilha):
+    return ler_excel(planilha)
+
+
+def test_sincronizar_igual_a_refazer(tabelas, tmp_path):
+    alteradas = _alterar(tabelas)
+    incremental = _banco_novo(str(tmp_path / 'a.db'), tabelas)
+    incremental.execute('BEGIN')
+    resultado = {nome: sincronizar(incremental, nome, df) for nome, df in alteradas.items()}
+    incremental.execute('COMMIT')
+    assert resultado['compras'] == (2, 6)  # saem 5 linhas e a corrigida; entram a corrigida e a repetida
+    assert resultado['custos'] == (0, 3)
+    assert resultado['receb'] == (0, 0)
+
+    completo = _banco_novo(str(tmp_path / 'b.db'), alteradas)
+    for nome in alteradas:
+        pd.testing.assert_frame_equal(_conteudo(incremental, nome, 'chave'), _conteudo(completo, nome, 'chave'))
+    ordem = 'tabela, periodo, dimensao, ano, mes, data, categoria'
+    pd.testing.assert_frame_equal(_conteudo(incremental, 'totais', ordem), _conteudo(completo, 'totais', ordem))
+
+
+def test_cubo_do_banco_igual_ao_cubo(tabelas, tmp_path):
+    from dados import indexar_por_data
+
+    con = _banco_novo(str(tmp_path / 'a.db'), tabelas)
+    do_banco = cubo_do_banco(con)
+    cubo = Cubo(*(indexar_por_data(nome, tabelas[nome]) for nome in ('compras', 'custos', 'receb')))
+    assert do_banco.total_mes == cubo.total_mes
+    assert do_banco.total_semana == cubo.total_semana
+    ano, mes = max(cubo.total_mes['compras'])
+    for nome in ('compras', 'custos', 'receb'):
+        pd.testing.assert_frame_equal(do_banco.resumo(nome, ano, mes).reset_index(drop=True),
+                                      cubo.resumo(nome, ano, mes).reset_index(drop=True), check_dtype=False,
+                                      check_categorical=False)
@@ -0,0 +1,20 @@
+from banco import conectar, importar_planilhas
+from cafe_report import criar_parser, main
+
+
+def test_check_e_arquivo_nao_se_confundem():
+    parser = criar_parser()
+    assert parser.parse_args(['--check']).check == 'itens.xlsx'
+    assert parser.parse_args(['--check', 'outra.xlsx']).check == 'outra.xlsx'
+    args = parser.parse_args(['mensal', '--arquivo', 'outra.xlsx'])
+    assert (args.check, args.arquivo) == (None, 'outra.xlsx')
+
+
+def test_semanal_sem_compras(planilha, capsys):
+    importar_planilhas(planilha, None, 'cafe.db')
+    con = conectar('cafe.db')
+    con.execute('DELETE FROM compras')
+    con.execute("DELETE FROM totais WHERE tabela = 'compras'")
+    con.close()
+    assert main(['semanal', '--banco', 'cafe.db']) == 1
+    assert 'nenhuma compra registrada' in capsys.readouterr().out
@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+from calendario import adicionar_colunas, semana_da_data
+
+
+def test_colunas_iguais_as_do_pandas():
+    # três anos inteiros, com as viradas de ano em que a semana ISO é 52/53/1
+    datas = pd.Series(pd.date_range('2019-12-01', '2023-01-31', freq='D'))
+    df = adicionar_colunas(pd.DataFrame({'Data': datas}), 'Data')
+    domingo = datas - pd.to_timedelta((datas.dt.dayofweek + 1) % 7, unit='D')
+    assert (df['InicioSemana'] == domingo).all()
+    assert (df['Ano'] == datas.dt.year).all()
+    assert (df['Mes'] == datas.dt.month).all()
+    # o número da semana é o da segunda seguinte ao domingo: os 7 dias têm o mesmo
+    segunda = domingo + pd.Timedelta(days=1)
+    assert (df['Semana'] == segunda.dt.isocalendar().week.astype('int64')).all()
+    assert df.groupby('InicioSemana')['Semana'].nunique().eq(1).all()
+
+
+@pytest.mark.parametrize('data, inicio', [
+    ('2025-01-04', '2024-12-29'),  # sábado: a semana começou no ano anterior
+    ('2025-01-05', '2025-01-05'),  # domingo abre a semana
+    ('2024-12-31', '2024-12-29'),
+    ('2025-06-13', '2025-06-08'),
+])
+def test_semana_de_domingo_a_sabado(data, inicio):
+    assert semana_da_data(data) == (pd.Timestamp(inicio), pd.Timestamp(inicio) + pd.Timedelta(days=6))
+
+
+def test_data_vazia_vira_nan():
+    df = adicionar_colunas(pd.DataFrame({'Data': pd.to_datetime(['2025-03-01', None])}), 'Data')
+    assert df['Ano'].tolist()[0] == 2025
+    assert df[['Ano', 'Mes', 'Semana']].iloc[1].isna().all()
+    assert pd.isna(df['InicioSemana'].iloc[1])
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from catalogo import Catalogo, usar_catalogo
+
+
+@pytest.mark.parametrize('a, b', [
+    ('STELLA LOG NECK 330ML', '(PROMO) STELLA LOG NECK 330ML'),
+    ('CACHAÇA SELETA 1L ', 'CACHACA SELETA 1L'),
+    ('SACOS DE GELO', 'SACO GELO'),
+    ('REFRIGERANTE GUARANA 2L', 'REFRIGERANTE GUARNA 2L'),  # erro de digitação
+    ('CERVEJA HEINEKEN LONG NECK 330ML', 'CERVEJA HEINEKN LONG NECK 330ML'),
+])
+def test_mesmo_item(a, b):
+    catalogo = Catalogo()
+    assert catalogo.id_de(a) == catalogo.id_de(b)
+
+
+@pytest.mark.parametrize('a, b', [
+    ('POLPA DE FRUTAS CAJA', 'POLPA DE FRUTAS CAJU'),
+    ('AGUA MINERAL COM GAS 500ML', 'AGUA MINERAL SEM GAS 500ML'),
+    ('FEIJAO PRETO 0,5KG', 'FEIJAO PRETO 1KG'),
+    ('QUEIJO PRATO FATIADO', 'QUEIJO MINAS FATIADO'),
+])
+def test_itens_diferentes(a, b):
+    catalogo = Catalogo()
+    assert catalogo.id_de(a) != catalogo.id_de(b)
+
+
+def test_ids_estaveis_entre_execucoes(tmp_path):
+    planilha = str(tmp_path / 'itens.xlsx')
+    nomes = pd.Series(['STELLA LOG NECK 330ML', 'CACHAÇA SELETA 1L', None, 'STELLA LOG NECK 330ML'])
+    with usar_catalogo(planilha) as catalogo:
+        ids = catalogo.mapear(nomes)
+    assert ids.isna().tolist() == [False, False, True, False]
+    assert ids[0] == ids[3] != ids[1]
+
+    # numa nova execução, apelidos novos caem nos ids já gravados
+    with usar_catalogo(planilha) as catalogo:
+        assert catalogo.id_de('(PROMO) STELLA LOG NECK 330ML') == ids[0]
+        assert catalogo.procurar('cachaca seleta 1l') == ids[1]
+        assert catalogo.procurar('ITEM QUE NAO EXISTE') is None
+        assert catalogo.nomes[ids[0]] == 'STELLA LOG NECK 330ML'
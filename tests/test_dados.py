@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from dados import fatia_datas
+
+
+@pytest.fixture
+def compras():
+    datas = pd.to_datetime(['2025-01-02 00:00', '2025-01-05 00:00', '2025-01-05 18:30', '2025-01-10 00:00',
+                            '2025-02-01 00:00'])
+    return pd.DataFrame({'TOTAL': range(len(datas))}, index=datas)
+
+
+@pytest.mark.parametrize('inicio, fim', [
+    ('2025-01-05', '2025-01-05'),  # o dia inteiro, inclusive com hora
+    ('2025-01-01', '2025-01-31'),
+    ('2025-01-03', '2025-01-04'),  # sem linhas
+    ('2024-01-01', '2026-01-01'),
+    ('2025-01-10 12:00', '2025-02-01 08:00'),
+])
+def test_fatia_igual_a_mascara(compras, inicio, fim):
+    fim_dia = pd.Timestamp(fim).normalize() + pd.Timedelta(days=1)
+    esperado = compras[(compras.index >= pd.Timestamp(inicio)) & (compras.index < fim_dia)]
+    pd.testing.assert_frame_equal(fatia_datas(compras, inicio, fim), esperado)
+
+
+def test_fatia_da_planilha(planilha):
+    from dados import carregar_planilhas
+
+    compras = carregar_planilhas(planilha)['compras']
+    assert compras.index.is_monotonic_increasing
+    fatia = fatia_datas(compras, '2025-05-01', '2025-05-31')
+    assert len(fatia) == ((compras.index >= '2025-05-01') & (compras.index < '2025-06-01')).sum() > 0
@@ -0,0 +1,97 @@
+"""Embalagem lida do nome do item e custo por unidade/litro das compras."""
+import json
+
+import pandas as pd
+import pytest
+
+from catalogo import Catalogo
+from embalagens import adicionar_custos, ler_ajustes, ler_embalagens
+
+
+@pytest.mark.parametrize('nome, unidades, litros', [
+    ('ESTRELA G LN 355ML (6UND)', 6, 0.355),
+    ('DV UVA LT 6X290ML RV', 6, 0.29),
+    ('GUARANA 1L ANTARCTICA 6PACK', 6, 1.0),
+    ('COPO DESC PP 400ML 50UND', 50, 0.4),
+    ('POLPA DE FRUTAS CAJU 4X12X100G', 48, None),
+    ('OVOS GRANDES BRANCO PVC C30UN', 30, None),
+    ('SMIRNOFF RED 1,75L', 1, 1.75),
+    ('(PROMO) STELLA LOG NECK 330ML', 1, 0.33),
+    ('PLACA POLIET AM 10X30X50', 1, None),
+    ('DV UVA 6X290', 1, None),
+    ('SACO LIXO PR 100UN 90/115 200L', 100, 200.0),
+])
+def test_leitura_do_nome(nome, unidades, litros):
+    lido = ler_embalagens(pd.Series([nome])).iloc[0]
+    assert lido['unidades'] == unidades
+    if litros is None:
+        assert pd.isna(lido['litros'])
+    else:
+        assert lido['litros'] == pytest.approx(litros)
+
+
+def _compras(linhas):
+    df = pd.DataFrame(linhas, columns=['Itens', 'tipo', 'Data', 'QUANTIDADE', 'TOTAL'])
+    df['Data'] = pd.to_datetime(df['Data'])
+    df['TOTAL'] = df['TOTAL'].astype('Int64')
+    catalogo = Catalogo()
+    df['ItemId'] = catalogo.mapear(df['Itens'])
+    return df, catalogo
+
+
+def test_quantidade_conta_pacotes():
+    # 12 pacotes de 6 latas, mesmo com 12 sendo múltiplo de 6
+    compras, catalogo = _compras([('ESTRELA G LN 355ML (6UND)', 'CERVEJA', '2025-06-03', 12.0, 36000)])
+    adicionar_custos(compras, catalogo)
+    linha = compras.iloc[0]
+    assert linha['UNIDADES'] == 72
+    assert linha['LITROS'] == pytest.approx(72 * 0.355)
+    assert linha['CUSTO UNIDADE'] == 500
+
+
+def test_capacidade_nao_vira_litros():
+    compras, catalogo = _compras([('SACO LIXO PR 100UN 90/115 200L', 'LIMPEZA', '2025-04-11', 4.0, 35508),
+                                  ('CAIXA TERMICA PROTICAL 32LT', 'COMIDA', '2025-04-11', 1.0, 9000)])
+    adicionar_custos(compras, catalogo)
+    assert compras['UNIDADES'].tolist() == [400, 1]
+    assert compras['LITROS'].isna().all()
+    assert compras['CUSTO LITRO'].isna().all()
+
+
+def test_ajuste_por_item(tmp_path):
+    caminho = tmp_path / 'embalagens.json'
+    caminho.write_text(json.dumps({
+        'DEL VAL MANGA LT 6X290ML RV': {'quantidade': 'unidades', 'ate': '2025-04-30'},
+        'DV UVA 6X290': {'unidades': 6, 'litros': 0.29},
+    }), encoding='utf-8')
+    compras, catalogo = _compras([
+        ('DEL VAL MANGA LT 6X290ML RV', 'SUCO', '2025-04-28', 6.0, 2021),
+        ('DEL VAL MANGA LT 6X290ML RV', 'SUCO', '2025-06-10', 1.0, 2021),
+        ('DV UVA 6X290', 'SUCO', '2025-06-10', 1.0, 2026),
+    ])
+    adicionar_custos(compras, catalogo, ler_ajustes(caminho))
+    assert compras['UNIDADES'].tolist() == [6, 6, 6]
+    assert compras['LITROS'].tolist() == pytest.approx([1.74, 1.74, 1.74])
+
+
+def test_ajuste_invalido(tmp_path):
+    caminho = tmp_path / 'embalagens.json'
+    caminho.write_text(json.dumps({'X': {'quantidade': 'caixas'}}), encoding='utf-8')
+    with pytest.raises(ValueError):
+        ler_ajustes(caminho)
+
+
+def test_ranking_do_banco_igual_ao_do_pandas(planilha):
+    from banco import conectar, importar_planilhas, ranking_custos_do_banco
+    from dados import carregar_planilhas, fatia_datas
+    from embalagens import ranking_custos
+
+    compras = carregar_planilhas(planilha)['compras']
+    importar_planilhas(planilha, None, 'cafe.db')
+    con = conectar('cafe.db')
+    try:
+        for inicio, fim in (('2025-01-01', '2025-12-31'), ('2025-03-01', '2025-03-31'), ('1999-01-01', '1999-12-31')):
+            pd.testing.assert_frame_equal(ranking_custos_do_banco(con, inicio, fim),
+                                          ranking_custos(fatia_datas(compras, inicio, fim)), check_dtype=False)
+    finally:
+        con.close()
@@ -0,0 +1,50 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from estoque import atualizar_razao
+
+
+@pytest.fixture
+def con():
+    con = sqlite3.connect(':memory:', isolation_level=None)
+    con.execute('CREATE TABLE compras (chave TEXT, ItemId INTEGER, Data TEXT, QUANTIDADE REAL, UNIDADES REAL)')
+    con.execute('CREATE TABLE contagens (chave TEXT, ItemId INTEGER, Data TEXT, QUANTIDADE REAL)')
+    yield con
+    con.close()
+
+
+def _razao(con):
+    return pd.read_sql_query('''SELECT item_id, data, ordem, tabela, chave, quantidade, saldo, ajuste
+                                FROM razao_estoque ORDER BY item_id, data, ordem, chave''', con)
+
+
+def test_compra_entra_em_unidades(con):
+    con.execute("INSERT INTO contagens VALUES ('k1', 1, '2025-06-06', 10)")
+    # 8 pacotes de 'ESTRELA G LN 355ML (6UND)' são 48 latas
+    con.execute("INSERT INTO compras VALUES ('c1', 1, '2025-06-09', 8, 48)")
+    con.execute("INSERT INTO contagens VALUES ('k2', 1, '2025-06-13', 50)")
+    atualizar_razao(con)
+    razao = _razao(con)
+    assert razao['saldo'].tolist() == [10, 58, 50]
+    assert razao['ajuste'].tolist()[-1] == -8
+
+
+def test_razao_incremental_igual_ao_completo(con):
+    con.executemany('INSERT INTO contagens VALUES (?, ?, ?, ?)', [
+        ('k1', 1, '2025-06-06', 10), ('k2', 2, '2025-06-06', 3), ('k3', 1, '2025-06-20', 20)])
+    con.executemany('INSERT INTO compras VALUES (?, ?, ?, ?, ?)', [
+        ('c1', 1, '2025-06-09', 2, 12), ('c2', 2, '2025-06-10', 1, 1), ('c3', 1, '2025-06-16', 1, 6)])
+    atualizar_razao(con)
+
+    con.execute("DELETE FROM compras WHERE chave = 'c1'")
+    con.execute("INSERT INTO compras VALUES ('c4', 1, '2025-06-12', 3, 18)")
+    con.execute("INSERT INTO contagens VALUES ('k4', 2, '2025-06-13', 2)")
+    assert atualizar_razao(con) != (0, 0)
+    incremental = _razao(con)
+
+    con.execute('DELETE FROM razao_estoque')
+    atualizar_razao(con)
+    pd.testing.assert_frame_equal(incremental, _razao(con))
+    assert atualizar_razao(con) == (0, 0)
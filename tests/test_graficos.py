@@ -0,0 +1,61 @@
+"""Gráficos SVG: valores negativos ou todos zero entram no PDF (fontes padrão, sem U+2212),
+os bytes não mudam entre renderizações e as figuras do pool são reaproveitadas."""
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import graficos
+from modelo_pdf import PDF
+
+
+@pytest.fixture
+def svg(monkeypatch):
+    monkeypatch.setattr(graficos, 'FORMATO', 'svg')
+
+
+@pytest.mark.parametrize('valores', [[-1500.0, 3200.0], [0.0, 0.0]], ids=['negativo', 'zerado'])
+def test_barras_no_pdf(svg, valores):
+    dados = pd.DataFrame({'tipo': ['CERVEJA', 'LIMPEZA'], 'TOTAL': valores})
+    pdf = PDF(date(2025, 1, 31))
+    pdf.add_page()
+    pdf.image(graficos.grafico_barras(dados, 'Compras', 'tipo', 'TOTAL'), w=180)
+
+
+def test_resumo_zerado_no_pdf(svg):
+    pdf = PDF(date(2025, 1, 31))
+    pdf.add_page()
+    pdf.image(graficos.grafico_barras_resumo([0, 0, 0], ['Compras', 'Custos', 'Recebido'], None, 'Resumo'), w=180)
+    assert graficos.grafico_pizza_resumo([0, 0, 0], ['Compras', 'Custos', 'Recebido'], None, 'Resumo') is None
+
+
+def test_svg_igual_a_cada_renderizacao(svg):
+    dados = pd.DataFrame({'tipo': ['CERVEJA', 'LIMPEZA'], 'TOTAL': [-1500.0, 3200.0]})
+    primeiro = graficos.grafico_barras(dados, 'Compras', 'tipo', 'TOTAL').getvalue()
+    # outro gráfico no meio: a figura do pool é limpa e redesenhada
+    graficos.grafico_barras_resumo([1, 2, 3], ['Compras', 'Custos', 'Recebido'], None, 'Resumo')
+    segundo = graficos.grafico_barras(dados, 'Compras', 'tipo', 'TOTAL').getvalue()
+    assert primeiro == segundo
+    assert b'<metadata' not in primeiro
+    assert '−'.encode() not in primeiro
+
+
+def test_pool_reaproveita_a_figura(svg, monkeypatch):
+    monkeypatch.setattr(graficos, '_figuras', {})
+    dados = pd.DataFrame({'tipo': ['CERVEJA'], 'TOTAL': [10.0]})
+    graficos.grafico_barras(dados, 'Compras', 'tipo', 'TOTAL')
+    figura = graficos._figuras[(8, 5)]
+    graficos.grafico_barras(dados, 'Compras', 'tipo', 'TOTAL')
+    graficos.grafico_pizza(dados, 'Compras', 'TOTAL', 'tipo')
+    assert graficos._figuras[(8, 5)] is figura
+    assert len(figura.axes) == 1
+    assert set(graficos._figuras) == {(8, 5), (6, 6)}
+
+
+@pytest.mark.parametrize('valores', [[0.0, 0.0], [float('nan'), float('nan')]], ids=['zerado', 'vazio'])
+def test_pizza_sem_valores_devolve_none(svg, monkeypatch, valores):
+    monkeypatch.setattr(graficos, '_figuras', {})
+    dados = pd.DataFrame({'tipo': ['CERVEJA', 'LIMPEZA'], 'TOTAL': valores})
+    assert graficos.grafico_pizza(dados, 'Custos', 'TOTAL', 'tipo') is None
+    # nada desenhado: nem a figura da pizza foi criada
+    assert graficos._figuras == {}
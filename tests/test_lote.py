@@ -0,0 +1,23 @@
+"""O pool de processos gera os mesmos bytes que o caminho serial."""
+import os
+
+import pandas as pd
+
+from agregacao import Cubo
+from dados import carregar_planilhas
+from lote import gerar_em_lote
+from manifesto import arquivo_da_tarefa
+
+
+def test_pool_igual_ao_serial(planilha):
+    dados = carregar_planilhas(planilha)
+    cubo = Cubo(dados['compras'], dados['custos'], dados['receb'])
+    fim = dados['compras']['Data'].max()
+    tarefas = [('mensal', fim.year, fim.month), ('anual', fim.year), ('periodo', fim - pd.Timedelta(days=13), fim)]
+
+    assert [erro for _, erro in gerar_em_lote(cubo, dados, tarefas, 'serial', processos=1)] == [None] * 3
+    assert [erro for _, erro in gerar_em_lote(cubo, dados, tarefas, 'pool', processos=2)] == [None] * 3
+    for tarefa in tarefas:
+        arquivo = arquivo_da_tarefa(tarefa)
+        with open(os.path.join('serial', arquivo), 'rb') as a, open(os.path.join('pool', arquivo), 'rb') as b:
+            assert a.read() == b.read(), arquivo
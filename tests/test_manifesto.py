@@ -0,0 +1,46 @@
+"""Modo incremental: sem mudança nos dados, a segunda execução não refaz nenhum PDF."""
+import pandas as pd
+
+from agregacao import Cubo
+from banco import TabelasDoBanco, importar_planilhas
+from dados import carregar_planilhas
+from lote import gerar_em_lote
+from manifesto import chaves_das_tarefas
+
+
+def _tarefas(dados):
+    fim = dados['compras']['Data'].max()
+    return [('mensal', fim.year, fim.month), ('periodo', fim - pd.Timedelta(days=13), fim)]
+
+
+def _gerar(dados, tarefas):
+    cubo = Cubo(dados['compras'], dados['custos'], dados['receb'])
+    return gerar_em_lote(cubo, dados, tarefas, 'relatorios', processos=1, incremental=True)
+
+
+def test_execucao_seguinte_pula_tudo(planilha):
+    dados = carregar_planilhas(planilha)  # leitura do xlsx
+    tarefas = _tarefas(dados)
+    assert [erro for _, erro in _gerar(dados, tarefas)] == [None, None]
+
+    dados = carregar_planilhas(planilha)  # agora do cache Parquet
+    assert _gerar(dados, tarefas) == []
+
+
+def test_chaves_iguais_na_planilha_no_cache_e_no_banco(planilha):
+    frio = carregar_planilhas(planilha)
+    tarefas = _tarefas(frio)
+    quente = carregar_planilhas(planilha)
+    importar_planilhas(planilha, None, 'cafe.db')
+    chaves = chaves_das_tarefas(tarefas, frio)
+    assert chaves_das_tarefas(tarefas, quente) == chaves
+    assert chaves_das_tarefas(tarefas, TabelasDoBanco('cafe.db')) == chaves
+
+
+def test_mudanca_no_mes_muda_a_chave(planilha):
+    dados = carregar_planilhas(planilha)
+    tarefas = _tarefas(dados)
+    compras = dados['compras'].copy()
+    compras.iloc[-1, compras.columns.get_loc('TOTAL')] += 1
+    outra = chaves_das_tarefas(tarefas, {**dados, 'compras': compras})
+    assert all(a != b for a, b in zip(outra, chaves_das_tarefas(tarefas, dados)))
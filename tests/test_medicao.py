@@ -0,0 +1,33 @@
+"""Métricas por etapa só são gravadas quando alguém passa o destino."""
+import json
+import os
+
+from agregacao import Cubo
+from dados import carregar_planilhas
+from lote import gerar_em_lote
+from medicao import ARQUIVO_METRICAS, Cronometro
+
+
+def test_sem_destino_nao_grava(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cronometro = Cronometro('execucao', comando='teste')
+    cronometro.marcar('carga')
+    assert cronometro.registrar(tarefas=1)['etapas'].keys() == {'carga'}
+    assert os.listdir(tmp_path) == []
+
+
+def test_lote_grava_no_destino(planilha, tmp_path):
+    dados = carregar_planilhas(planilha)
+    cubo = Cubo(dados['compras'], dados['custos'], dados['receb'])
+    fim = dados['compras']['Data'].max()
+    tarefas = [('mensal', fim.year, fim.month), ('anual', fim.year)]
+
+    gerar_em_lote(cubo, dados, tarefas, 'relatorios', processos=1)
+    assert not os.path.exists(ARQUIVO_METRICAS)
+
+    destino = str(tmp_path / 'metricas' / 'm.jsonl')
+    os.makedirs(os.path.dirname(destino))
+    gerar_em_lote(cubo, dados, tarefas, 'relatorios', processos=2, metricas=destino)
+    with open(destino, encoding='utf-8') as f:
+        linhas = [json.loads(linha) for linha in f]
+    assert sorted(linha['relatorio'] for linha in linhas) == ['anual', 'mensal']
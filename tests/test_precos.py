@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+import banco
+from banco import conectar, sincronizar
+from dados import indexar_por_data, ler_excel
+from precos import altas_de_preco, altas_no_banco, atualizar_historico, estatisticas_precos
+
+
+def _compras(precos, item=1):
+    datas = pd.date_range('2025-01-06', periods=len(precos), freq='7D')
+    return pd.DataFrame({'ItemId': item, 'Itens': 'CAFE 500G', 'Data': datas,
+                         'VALOR UND': pd.array([p * 100 for p in precos], dtype='Int64')})
+
+
+def test_alta_acima_da_mediana():
+    historico = estatisticas_precos(_compras([10, 10, 11, 13, 12, 10]))
+    assert historico['historico'].tolist() == [0, 1, 2, 3, 4, 5]
+    assert historico['mediana'].iloc[3] == 1000
+    # 13 é 30% acima da mediana (10); 12 fica abaixo dos 20% da mediana de 10,5
+    assert historico['alta'].tolist() == [False, False, False, True, False, False]
+
+
+def test_janela_de_90_dias():
+    compras = _compras([10, 10, 10])
+    compras.loc[3] = [1, 'CAFE 500G', pd.Timestamp('2025-06-01'), 1300]
+    historico = estatisticas_precos(compras)
+    # as compras de janeiro ficaram fora da janela: sem histórico, sem alerta
+    assert historico['historico'].iloc[-1] == 0
+    assert not historico['alta'].iloc[-1]
+
+
+def _com_historico(caminho, compras):
+    con = conectar(caminho, criar=True)
+    con.execute('BEGIN')
+    banco._conferir_versao(con)
+    sincronizar(con, 'compras', compras)
+    atualizar_historico(con)
+    con.execute('COMMIT')
+    return con
+
+
+def _historico(con):
+    return pd.read_sql_query('SELECT * FROM historico_precos ORDER BY chave', con)
+
+
+@pytest.fixture
+def compras(planilha):
+    compras = ler_excel(planilha)['compras']
+    # a planilha sintética repete pouco cada item: em 5 itens há histórico e altas de sobra
+    compras['ItemId'] = compras['ItemId'] % 5 + 1
+    return compras
+
+
+def test_historico_incremental_igual_ao_completo(compras, tmp_path):
+    alteradas = compras.iloc[3:].reset_index(drop=True)
+    alteradas.loc[len(alteradas) // 2, 'VALOR UND'] *= 3  # uma alta no meio do ano
+    incremental = _com_historico(str(tmp_path / 'a.db'), compras)
+    incremental.execute('BEGIN')
+    sincronizar(incremental, 'compras', alteradas)
+    inseridas, removidas = atualizar_historico(incremental)
+    incremental.execute('COMMIT')
+    assert 0 < inseridas < len(alteradas)  # só os itens alterados, só no trecho da janela
+
+    completo = _com_historico(str(tmp_path / 'b.db'), alteradas)
+    pd.testing.assert_frame_equal(_historico(incremental), _historico(completo))
+
+
+def test_altas_do_banco_iguais_as_do_pandas(compras, tmp_path):
+    con = _com_historico(str(tmp_path / 'a.db'), compras)
+    inicio, fim = compras['Data'].min(), compras['Data'].max()
+    esperado = altas_de_preco(estatisticas_precos(indexar_por_data('compras', compras.copy())), inicio, fim)
+    do_banco = altas_no_banco(con, inicio, fim)
+    assert len(do_banco) > 0
+    pd.testing.assert_frame_equal(do_banco[['ItemId', 'Data', 'preco', 'historico']].reset_index(drop=True),
+                                  esperado[['ItemId', 'Data', 'preco', 'historico']].reset_index(drop=True),
+                                  check_dtype=False)